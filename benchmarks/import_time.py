@@ -0,0 +1,73 @@
+"""
+This script measures the import time of puml in fresh interpreters and checks that no
+optional heavy dependency is imported eagerly.
+
+Usage
+-----
+python benchmarks/import_time.py --repeat 10 --limit 0.1
+"""
+
+from argparse import ArgumentParser
+from json import dumps
+from statistics import median
+from subprocess import run
+from sys import executable
+
+# dependencies only needed for rendering, must not be imported by "import puml"
+HEAVY = ("requests", "urllib3", "plantweb", "asyncio", "multiprocessing")
+
+_SCRIPT = f"""
+import sys, time
+start = time.perf_counter()
+import puml
+print(time.perf_counter() - start)
+print(" ".join(m for m in {HEAVY!r} if m in sys.modules))
+"""
+
+
+def measure(repeat: int = 10) -> dict:
+    """
+    Imports puml in fresh interpreters.
+
+    Parameters
+    ----------
+    repeat : int
+        number of interpreters (default = 10)
+
+    Returns
+    -------
+    dict
+        median, minimum and maximum import time in seconds and eagerly imported heavy
+        dependencies
+    """
+    times, heavy = [], set()
+    for _ in range(repeat):
+        output = run(
+            [executable, "-c", _SCRIPT], capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+        times.append(float(output[0]))
+        heavy.update(output[1].split() if len(output) > 1 else ())
+    return {
+        "median": median(times),
+        "min": min(times),
+        "max": max(times),
+        "heavy": sorted(heavy),
+    }
+
+
+def main(argv: list = None) -> int:
+    """Prints the import time as JSON, fails if it exceeds the limit."""
+    parser = ArgumentParser(description="measures the import time of puml")
+    parser.add_argument("-r", "--repeat", type=int, default=10)
+    parser.add_argument("-l", "--limit", type=float, help="maximal median in seconds")
+    args = parser.parse_args(argv)
+
+    result = measure(args.repeat)
+    print(dumps({"import": result}, indent=2))
+    if result["heavy"] or (args.limit and result["median"] > args.limit):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
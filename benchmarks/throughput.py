@@ -0,0 +1,269 @@
+"""
+This script measures the throughput and peak memory of every stage of puml on synthetic
+modules with N classes, M members per class and annotations nested D levels deep.
+
+Stages
+------
+parse    reading and parsing the source files (ParseCache.get)
+extract  extracting the class charts of the parsed files (extract_classes)
+repr     emitting the puml-syntax of the uml-chart (UmlChart.__repr__)
+draw     drawing the uml-chart with a fake renderer (UmlChart.draw)
+
+Usage
+-----
+python benchmarks/throughput.py --classes 200 --members 20 --depth 3 --output run.json
+python benchmarks/throughput.py --baseline run.json --tolerance 0.2
+"""
+
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from gc import collect
+from json import dumps, load
+from os.path import abspath, dirname, getsize, join
+from platform import python_version
+from statistics import median
+from sys import path as sys_path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from tracemalloc import get_traced_memory, start, stop
+
+sys_path.insert(0, dirname(dirname(abspath(__file__))))
+
+from puml.src import FakeRenderer, UmlChart, parse_cache  # noqa: E402
+from puml.src import annotation, extract_class  # noqa: E402
+from puml.src.extract_class import extract_classes  # noqa: E402
+
+STAGES = ("parse", "extract", "repr", "draw")
+
+_TYPES = ("int", "str", "float", "bool", "bytes")
+_GENERICS = ("Optional", "List", "Dict[str, {}]", "Tuple[int, {}]", "Union[None, {}]")
+
+
+def annotation_of(depth: int, seed: int) -> str:
+    """
+    Returns an annotation nesting typing generics depth levels deep.
+
+    Examples
+    --------
+    >>> annotation_of(2, 0)
+    'List[Optional[int]]'
+    """
+    result = _TYPES[seed % len(_TYPES)]
+    for level in range(depth):
+        generic = _GENERICS[(seed + level) % len(_GENERICS)]
+        result = generic.format(result) if "{}" in generic else f"{generic}[{result}]"
+    return result
+
+
+def generate_module(classes: int, members: int, depth: int, offset: int = 0) -> str:
+    """
+    Generates the source code of a module with classes of half attributes and half
+    methods.
+
+    Parameters
+    ----------
+    classes : int
+        number of classes
+    members : int
+        number of members per class
+    depth : int
+        nesting depth of the annotations
+    offset : int
+        number of the first class (default = 0)
+
+    Returns
+    -------
+    str
+        source code
+    """
+    lines = ["from typing import Dict, List, Optional, Tuple, Union", ""]
+    for c in range(offset, offset + classes):
+        lines += ["", f"class Class{c}:", "    def __init__(self):"]
+        attributes = max(1, members // 2)
+        for m in range(attributes):
+            lines.append(f"        self.attr_{m}: {annotation_of(depth, c + m)} = None")
+        for m in range(members - attributes):
+            hint = annotation_of(depth, c + m + 1)
+            lines += [
+                "",
+                f"    def method_{m}(self, arg: {hint}, other: Class{c}) -> {hint}:",
+                "        self._cache = None",
+                "        return arg",
+            ]
+    return "\n".join(lines) + "\n"
+
+
+def run_once(
+    directory: str, files: list[str], renderer: FakeRenderer, trace: bool = False
+) -> dict:
+    """
+    Runs every stage once with empty caches.
+
+    Parameters
+    ----------
+    directory : str
+        directory of the drawn chart
+    files : list
+        paths of the synthetic modules
+    renderer : FakeRenderer
+        renderer of the drawn chart
+    trace : bool
+        traces the memory allocations, which slows down every stage (default = False)
+
+    Returns
+    -------
+    dict
+        wall time in seconds or peak traced memory in bytes per stage
+    """
+    parse_cache.clear()
+    annotation.clear_cache()
+    extract_class.clear_cache()
+    uml = UmlChart(renderer=renderer)
+
+    def _parse() -> None:
+        for file in files:
+            parse_cache.get(file)
+
+    def _extract() -> None:
+        for file in files:
+            uml.classes.extend(extract_classes(file, module="synthetic"))
+
+    def _draw() -> None:
+        uml.draw(join(directory, "chart.svg"))
+
+    results = {}
+    for stage, function in (
+        ("parse", _parse),
+        ("extract", _extract),
+        ("repr", lambda: str(uml)),
+        ("draw", _draw),
+    ):
+        collect()
+        if trace:
+            start()
+            function()
+            results[stage] = get_traced_memory()[1]
+            stop()
+        else:
+            begin = perf_counter()
+            function()
+            results[stage] = perf_counter() - begin
+    return results
+
+
+def measure(classes: int, members: int, depth: int, files: int, repeat: int) -> dict:
+    """
+    Generates the synthetic modules and measures every stage.
+
+    Parameters
+    ----------
+    classes : int
+        total number of classes
+    members : int
+        number of members per class
+    depth : int
+        nesting depth of the annotations
+    files : int
+        number of modules the classes are distributed over
+    repeat : int
+        number of timed runs, the median wall time is reported and the peak memory of
+        one additional traced run
+
+    Returns
+    -------
+    dict
+        per stage the wall time, classes per second and peak memory
+    """
+    with TemporaryDirectory() as directory:
+        paths, per_file = [], -(-classes // files)
+        for i in range(files):
+            count = min(per_file, classes - i * per_file)
+            paths.append(join(directory, f"synthetic_{i}.py"))
+            with open(paths[-1], "w") as file:
+                file.write(generate_module(count, members, depth, i * per_file))
+        source_bytes = sum(getsize(p) for p in paths)
+
+        renderer = FakeRenderer(b"<svg/>")
+        runs = [run_once(directory, paths, renderer) for _ in range(repeat)]
+        peaks = run_once(directory, paths, renderer, trace=True)
+
+    stages = {}
+    for stage in STAGES:
+        seconds = median(run[stage] for run in runs)
+        stages[stage] = {
+            "seconds": seconds,
+            "classes_per_second": classes / seconds if seconds else None,
+            "peak_bytes": peaks[stage],
+        }
+    stages["parse"]["bytes"] = source_bytes
+    stages["repr"]["bytes"] = len(renderer.calls[-1][0].encode())
+    return stages
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Returns the stages slower than the baseline by more than the tolerance.
+
+    Examples
+    --------
+    >>> compare({"parse": {"seconds": 2.0}}, {"parse": {"seconds": 1.0}}, 0.5)
+    ['parse: 1.000s -> 2.000s (+100%)']
+    """
+    regressions = []
+    for stage, values in result.items():
+        before = baseline.get(stage, {}).get("seconds")
+        if before and values["seconds"] > before * (1 + tolerance):
+            change = values["seconds"] / before - 1
+            regressions.append(
+                f"{stage}: {before:.3f}s -> {values['seconds']:.3f}s ({change:+.0%})"
+            )
+    return regressions
+
+
+def main(argv: list = None) -> int:
+    """Prints the measurements as JSON, fails on regressions against a baseline."""
+    parser = ArgumentParser(description="measures the throughput of puml")
+    parser.add_argument("-n", "--classes", type=int, default=200)
+    parser.add_argument("-m", "--members", type=int, default=20)
+    parser.add_argument("-d", "--depth", type=int, default=3)
+    parser.add_argument("-f", "--files", type=int, default=10)
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="writes the results to a JSON file")
+    parser.add_argument("-b", "--baseline", help="JSON file of a previous run")
+    parser.add_argument("-t", "--tolerance", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    parameters = {
+        "classes": args.classes,
+        "members": args.members,
+        "depth": args.depth,
+        "files": args.files,
+        "repeat": args.repeat,
+    }
+    report = {
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": python_version(),
+        "parameters": parameters,
+        "stages": measure(**parameters),
+    }
+    text = dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            baseline = load(file)
+        if baseline["parameters"] != parameters:
+            print(f"parameters differ from baseline <{args.baseline}>")
+            return 2
+        regressions = compare(report["stages"], baseline["stages"], args.tolerance)
+        for regression in regressions:
+            print(f"regression {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,27 +5,18 @@ This package contains all necessary classes to generate a uml chart from source
 a logger object for development reasons. 
 """
 
-from logging import (
-    getLogger,
-    DEBUG,
-    WARNING,
-    Formatter,
-    StreamHandler,
-)
-
-level = WARNING
-logger = getLogger()
-logger.setLevel(level)
-
-formatter = Formatter(
-    "%(asctime)s - %(levelname)s : %(message)s", datefmt="%d.%m %H:%M"
-)
-
-# logger output in terminal
-console_handler = StreamHandler()
-console_handler.setFormatter(formatter)
-logger.addHandler(console_handler)
+from logging import getLogger, NullHandler
 
+# applications configure the output, see logging.basicConfig
+logger = getLogger("puml")
+logger.addHandler(NullHandler())
 
+from .stats import Stats
+from .parse_cache import ParseCache, parse_cache
+from .member import Member
 from .extract_class import ClassChart
+from .renderer import Renderer, RemoteRenderer, LocalRenderer, FakeRenderer
+from .session import RenderSession
+from .render_cache import RenderCache
+from .manifest import Manifest
 from .construct_uml import UmlChart
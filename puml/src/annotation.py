@@ -0,0 +1,98 @@
+"""
+This module contains the formatting of type annotations from the syntax tree. String
+forward references are parsed once and memoized.
+"""
+
+from ast import (
+    parse,
+    unparse,
+    AST,
+    Attribute,
+    BinOp,
+    BitOr,
+    Constant,
+    List,
+    Name,
+    Starred,
+    Subscript,
+    Tuple,
+)
+from functools import lru_cache
+
+from puml.src.member import EMPTY
+
+
+def format_annotation(node: AST) -> str:
+    """
+    Formats an annotation of the syntax tree to puml-syntax.
+
+    Parameters
+    ----------
+    node : AST or None
+        annotation node
+
+    Returns
+    -------
+    str
+        formatted annotation like "Optional[List[int]]", "np.ndarray" or "int | None",
+        "EMPTY" if the annotation is missing
+    """
+    # handles basic annotation
+    if isinstance(node, Name):
+        return node.id
+
+    # handles typing annotation like Union, Tuple, etc.
+    elif isinstance(node, Subscript):
+        value = format_annotation(node.value)
+        return f"{value}[{_format_slice(node, value)}]"
+
+    # handles dotted annotation like np.ndarray
+    elif isinstance(node, Attribute):
+        return f"{format_annotation(node.value)}.{node.attr}"
+
+    # handles PEP 604 unions like int | None
+    elif isinstance(node, BinOp) and isinstance(node.op, BitOr):
+        return f"{format_annotation(node.left)} | {format_annotation(node.right)}"
+
+    # handles constant annotations like None and string forward references
+    elif isinstance(node, Constant):
+        if isinstance(node.value, str):
+            return _format_forward_reference(node.value)
+        return "..." if node.value is Ellipsis else f"{node.value}"
+
+    # handles parameter lists like Callable[[int, str], bool]
+    elif isinstance(node, (List, Tuple)):
+        elements = ", ".join(format_annotation(n) for n in node.elts)
+        return f"[{elements}]" if isinstance(node, List) else elements
+
+    # handles unpacking like *Ts
+    elif isinstance(node, Starred):
+        return f"*{format_annotation(node.value)}"
+
+    elif node is None:
+        return EMPTY
+
+    return unparse(node)
+
+
+def clear_cache() -> None:
+    """Removes all memoized forward references."""
+    _format_forward_reference.cache_clear()
+
+
+def _format_slice(node: Subscript, value: str) -> str:
+    """helper function to format the slice of a subscript without brackets"""
+    # values of Literal are no forward references
+    formatter = unparse if value.rsplit(".", 1)[-1] == "Literal" else format_annotation
+    if isinstance(node.slice, Tuple):
+        return ", ".join(formatter(n) for n in node.slice.elts)
+    return formatter(node.slice)
+
+
+@lru_cache(maxsize=1024)
+def _format_forward_reference(value: str) -> str:
+    """helper function to format string annotations like "MockCore" """
+    try:
+        return format_annotation(parse(value, mode="eval").body)
+    except SyntaxError:
+        return value
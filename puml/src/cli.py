@@ -0,0 +1,216 @@
+"""
+This module contains the command line interface "puml" to extract and draw several
+uml-charts described by a JSON config file.
+
+Config file
+-----------
+{
+    "renderer": "remote",
+    "workers": 4,
+    "charts": {
+        "core": {
+            "output": "docs/core.svg",
+            "formats": ["svg", "png", "puml"],
+            "root_module": "mypackage",
+            "packages": ["mypackage.core"],
+            "modules": ["mypackage.io"],
+            "paths": ["src/mypackage/plugins"],
+            "classes": ["mypackage.api.Client"],
+            "relations": [["Client", "Core", "--o"]],
+            "infer_relations": true
+        }
+    }
+}
+
+"packages", "modules" and "classes" are imported, "paths" are extracted statically.
+"formats" replace the extension of "output" (default = only "output" as svg image).
+"""
+
+from argparse import ArgumentParser
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from json import dump, load
+from logging import basicConfig, INFO, WARNING
+from os import makedirs
+from os.path import dirname
+from time import perf_counter
+
+from puml.src import logger, UmlChart
+from puml.src.manifest import Manifest
+from puml.src.renderer import get_renderer
+from puml.src.session import RenderSession
+from puml.src.watch import Watcher
+
+
+def main(argv: list = None) -> int:
+    """
+    Runs the command line interface.
+
+    Parameters
+    ----------
+    argv : list
+        command line arguments (default = None, arguments of the process)
+
+    Returns
+    -------
+    int
+        exit code
+    """
+    parser = ArgumentParser(
+        prog="puml", description="extracts and draws uml-charts of a config file"
+    )
+    parser.add_argument("config", help="JSON file describing the charts")
+    parser.add_argument(
+        "-r",
+        "--renderer",
+        help='"remote", "local", "fake" or "session" (long-lived local PlantUML)',
+    )
+    parser.add_argument("-w", "--workers", type=int, help="number of parallel workers")
+    parser.add_argument("-c", "--chart", action="append", help="only draws this chart")
+    parser.add_argument(
+        "-m", "--manifest", help="only draws charts whose sources changed"
+    )
+    parser.add_argument(
+        "-p", "--print", action="store_true", help="prints puml-syntax, no drawing"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="logs progress")
+    parser.add_argument("-s", "--stats", help="writes the stage statistics to a JSON")
+    parser.add_argument(
+        "-W", "--watch", action="store_true", help="draws again on source changes"
+    )
+    args = parser.parse_args(argv)
+    basicConfig(
+        level=INFO if args.verbose else WARNING,
+        format="%(asctime)s - %(levelname)s : %(message)s",
+        datefmt="%d.%m %H:%M",
+    )
+
+    with open(args.config, "r") as file:
+        config = load(file)
+    workers = args.workers or config.get("workers", 1)
+    renderer = args.renderer or config.get("renderer")
+    specs = {
+        name: spec
+        for name, spec in config["charts"].items()
+        if not args.chart or name in args.chart
+    }
+
+    timings: dict[str, dict[str, float]] = {}
+
+    # extraction
+    charts = {}
+    for name, spec in specs.items():
+        start = perf_counter()
+        charts[name] = build_chart(spec, workers)
+        timings[name] = {"extract": perf_counter() - start}
+
+    if args.print:
+        for uml in charts.values():
+            print(uml)
+        return 0
+
+    # rendering
+    manifest = Manifest(args.manifest) if args.manifest else None
+    with ExitStack() as stack:
+        if renderer == RenderSession.name:
+            renderer = stack.enter_context(RenderSession(workers=workers))
+        else:
+            renderer = get_renderer(renderer)
+        _render(charts, specs, renderer, manifest, workers, timings)
+        if manifest is not None:
+            manifest.save()
+
+        _report(charts, timings)
+        if args.stats:
+            with open(args.stats, "w") as file:
+                dump({name: uml.stats.to_dict() for name, uml in charts.items()}, file)
+
+        if args.watch:
+            watched = [
+                (uml, _output(name, specs[name]), specs[name].get("formats"))
+                for name, uml in charts.items()
+            ]
+            watcher = Watcher(watched, renderer)
+            try:
+                watcher.run()
+            except KeyboardInterrupt:
+                pass
+    return 0
+
+
+def build_chart(spec: dict, workers: int = None) -> UmlChart:
+    """
+    Extracts the classes and relations of a chart described in a config file.
+
+    Parameters
+    ----------
+    spec : dict
+        chart description with the keys "root_module", "packages", "modules", "paths",
+        "classes", "relations" and "infer_relations"
+    workers : int
+        number of processes parsing the source files in parallel (default = None)
+
+    Returns
+    -------
+    UmlChart
+        extracted uml-chart
+    """
+    uml = UmlChart(root_module=spec.get("root_module"))
+    for name in spec.get("packages", ()):
+        uml.add_package(import_module(name), workers=workers)
+    for name in spec.get("modules", ()):
+        uml.add_module(import_module(name), workers=workers)
+    for path in spec.get("paths", ()):
+        uml.add_path(path, workers=workers)
+    for name in spec.get("classes", ()):
+        module, _, qualname = name.rpartition(".")
+        uml.add_class(getattr(import_module(module), qualname))
+
+    if spec.get("infer_relations", False):
+        uml.infer_relations()
+    names = {cls.name: cls for cls in uml.classes}
+    names.update({cls.qualname: cls for cls in uml.classes})
+    for source, target, kind in spec.get("relations", ()):
+        uml.add_relation(names[source], names[target], kind)
+    return uml
+
+
+def _render(charts, specs, renderer, manifest, workers, timings) -> None:
+    """helper function to draw all charts with a thread pool"""
+
+    def _draw(name: str) -> None:
+        """helper function to draw and time one chart"""
+        start, output = perf_counter(), _output(name, specs[name])
+        formats = specs[name].get("formats")
+        if dirname(output):
+            makedirs(dirname(output), exist_ok=True)
+        if manifest is None:
+            charts[name].draw(output, renderer, formats)
+        elif not charts[name].update(output, manifest, renderer, formats):
+            logger.info(f"<{output}> is up to date")
+        # the puml-syntax is emitted once while drawing and recorded by the chart
+        emit = charts[name].stats.stages.get("emit", {}).get("seconds", 0.0)
+        timings[name].update(emit=emit, render=perf_counter() - start - emit)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(_draw, name) for name in charts]:
+            future.result()
+
+
+def _output(name: str, spec: dict) -> str:
+    """helper function to get the target file of a chart"""
+    return spec.get("output", f"{name}.svg")
+
+
+def _report(charts: dict, timings: dict) -> None:
+    """helper function to print the duration of every stage per chart"""
+    stages = ("extract", "emit", "render")
+    print(f"{'chart':<24}{'classes':>8}" + "".join(f"{s:>10}" for s in stages))
+    for name, timing in timings.items():
+        values = "".join(f"{timing.get(s, 0):>9.3f}s" for s in stages)
+        print(f"{name:<24}{len(charts[name].classes):>8}{values}")
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,9 +3,27 @@ This module contains the "UmlChart"-class (user interface) to handle class-chart
 extraction and puml-chart-code generation.
 """
 
-from plantweb.render import render
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+from importlib import import_module
+from inspect import getfile, getmembers, isabstract, isclass
+from os import replace, walk
+from os.path import abspath, isdir, join, splitext
+from pkgutil import walk_packages
+from types import ModuleType
+from typing import Iterator, TextIO
 
-from puml.src import logger, ClassChart
+from puml.src import logger, model, ClassChart
+from puml.src.extract_class import extract_classes, module_name
+from puml.src.graph import ClassGraph, matches_kind
+from puml.src.manifest import Manifest
+from puml.src.parse_cache import parse_cache, ParsedModule
+from puml.src.partition import partition
+from puml.src.relations import RELATIONS, find_relations
+from puml.src.renderer import Renderer, get_renderer, wrap
+from puml.src.render_cache import RenderCache
+from puml.src.session import RenderSession
+from puml.src.stats import Stats
 
 
 class UmlChart:
@@ -14,7 +32,14 @@ class UmlChart:
 
     Parameters
     ----------
-    None
+    root_module : str
+    renderer : Renderer, str or None
+        rendering backend instance or name like "remote", "local" or "fake" (default =
+        None, the environment variable "PUML_RENDERER" or "remote")
+    cache : RenderCache or None
+        on-disk cache of rendered images (default = None, renders on every call)
+    stats : Stats or None
+        recorder of the wall time and counters per stage (default = None, a new one)
 
     Attributes
     ----------
@@ -23,6 +48,16 @@ class UmlChart:
     relations: dict
         the key is tuple of two ClassChart instances and the value is puml-expression
         for the relation as string
+    renderer : Renderer, str or None
+        rendering backend used by draw()
+    links : dict
+        the key is a ClassChart instance drawn without members and the value is the
+        hyperlink to the chart containing it
+    cache : RenderCache or None
+        on-disk cache of rendered images used by draw()
+    stats : Stats
+        wall time and counters of locating, parsing, extracting, emitting and
+        rendering, exportable with "stats.to_json()"
 
     Examples
     --------
@@ -35,28 +70,65 @@ class UmlChart:
     >>> print(uml) # for puml syntax as string
     """
 
-    def __init__(self, root_module: str = None):
+    def __init__(
+        self,
+        root_module: str = None,
+        renderer: Renderer | str = None,
+        cache: RenderCache = None,
+        stats: Stats = None,
+    ):
         self.classes: list = []
         self.relations: dict[tuple, str] = {}
         self.root = root_module
+        self.renderer = renderer
+        self.cache = cache
+        self.links: dict[ClassChart, str] = {}
+        self.stats = Stats() if stats is None else stats
 
     def __repr__(self):
         """representation-method to print puml-syntax"""
-        # packaging
-        self._set_root()
+        return "\n".join(self.iter_lines())
 
-        output = "\n"
-        # classes
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Yields the puml-syntax of the uml-chart line by line.
+
+        Yields
+        ------
+        str
+            line of puml-syntax without line break
+        """
+        yield ""
+        # classes with packaging
         for cls in self.classes:
-            output += f"{cls}\n"
+            yield from cls.iter_lines(self._set_root(cls.module))
+        for cls, link in self.links.items():
+            yield f"{cls.kind} {self._set_root(cls.module)}.{cls.name} [[{link}]] {{"
+            yield "}"
+        yield ""
 
         # relations
         for pair, rel in self.relations.items():
-            output += f"\n{pair[0].name} {rel} {pair[1].name}"
+            yield f"{pair[0].name} {rel} {pair[1].name}"
 
-        return output
+    def write_to(self, stream: TextIO) -> None:
+        """
+        Writes the puml-syntax of the uml-chart to a text stream without building the
+        whole string.
 
-    def add_class(self, cls: type, kind: str = "class") -> ClassChart:
+        Parameters
+        ----------
+        stream : TextIO
+            target stream like an opened file
+        """
+        lines = self.iter_lines()
+        stream.write(next(lines))
+        for line in lines:
+            stream.write(f"\n{line}")
+
+    def add_class(
+        self, cls: type, kind: str = "class", inherited: bool = False
+    ) -> ClassChart:
         """
         Adds a class to the uml-chart.
 
@@ -65,16 +137,125 @@ class UmlChart:
         cls : type
             target class type
         kind : "abstract", "class" or "interface"
+        inherited : bool
+            adds the members of the base classes along the method resolution order
+            (default = False)
 
         Returns
         -------
         ClassChart
             target class as ClassChart instance
         """
-        value = ClassChart(cls, kind)
+        with self.stats.stage("locate", files=1):
+            file = getfile(cls)
+        source = self._parse(file)
+        with self.stats.stage("extract", classes=1):
+            value = ClassChart(cls, kind, inherited, source)
         self.classes.append(value)
         return value
 
+    def add_module(
+        self, module: ModuleType, workers: int = None, inherited: bool = False
+    ) -> list[ClassChart]:
+        """
+        Adds all classes defined in a module to the uml-chart.
+
+        Parameters
+        ----------
+        module : ModuleType
+            target module
+        workers : int
+            number of processes parsing the source files in parallel (default = None,
+            extracts in the current process)
+        inherited : bool
+            adds the members of the base classes, every base class is extracted once
+            (default = False)
+
+        Returns
+        -------
+        list
+            target classes as ClassChart instances
+        """
+        return self._add_modules([module], workers, inherited)
+
+    def add_package(
+        self,
+        package: ModuleType,
+        pattern: str = "*",
+        workers: int = None,
+        inherited: bool = False,
+    ) -> list[ClassChart]:
+        """
+        Adds all classes defined in a package and its subpackages to the uml-chart.
+
+        Parameters
+        ----------
+        package : ModuleType
+            target package
+        pattern : str
+            shell-style pattern the full module names have to match (default = "*")
+        workers : int
+            number of processes parsing the source files in parallel (default = None,
+            extracts in the current process)
+        inherited : bool
+            adds the members of the base classes, every base class is extracted once
+            (default = False)
+
+        Returns
+        -------
+        list
+            target classes as ClassChart instances
+        """
+        names = [package.__name__]
+        if hasattr(package, "__path__"):
+            for info in walk_packages(package.__path__, f"{package.__name__}."):
+                names.append(info.name)
+        modules = [import_module(n) for n in names if fnmatchcase(n, pattern)]
+        return self._add_modules(modules, workers, inherited)
+
+    def add_path(
+        self,
+        path: str,
+        root: str = None,
+        pattern: str = "*.py",
+        workers: int = None,
+    ) -> list[ClassChart]:
+        """
+        Adds all top-level classes of source files to the uml-chart without importing
+        them (static extraction).
+
+        Parameters
+        ----------
+        path : str or path-object
+            source file or directory searched recursively for source files
+        root : str or path-object
+            source root the module paths are resolved against (default = None, the
+            topmost directory of the package containing each file)
+        pattern : str
+            shell-style pattern the file names have to match (default = "*.py")
+        workers : int
+            number of processes parsing the source files in parallel (default = None,
+            extracts in the current process)
+
+        Returns
+        -------
+        list
+            target classes as ClassChart instances
+        """
+        path = abspath(path)
+        if isdir(path):
+            paths = [
+                join(directory, name)
+                for directory, _, names in sorted(walk(path))
+                for name in sorted(names)
+                if fnmatchcase(name, pattern)
+            ]
+        else:
+            paths = [path]
+
+        jobs = [(file, None, module_name(file, root)) for file in paths]
+        return self._extract_files(jobs, workers)
+
     def add_relation(
         self, arg1: ClassChart, arg2: ClassChart, kind: str = "--|>"
     ) -> None:
@@ -90,7 +271,107 @@ class UmlChart:
         """
         self.relations[(arg1, arg2)] = kind
 
-    def draw(self, file: str = "chart.svg") -> None:
+    def infer_relations(self, kinds: tuple = tuple(RELATIONS)) -> None:
+        """
+        Adds relations derived from base classes and annotations of all classes, so
+        "add_relation" is only needed for relations not visible in the annotations.
+        Existing relations are kept.
+
+        Parameters
+        ----------
+        kinds : tuple
+            "inheritance" (--|>), "composition" (*--) and/or "dependency" (..>)
+            (default = all)
+        """
+        for pair, kind in find_relations(self.classes, kinds).items():
+            self.relations.setdefault(pair, kind)
+
+    def graph(self) -> ClassGraph:
+        """
+        Returns adjacency indexes over the classes and relations of the uml-chart.
+
+        Returns
+        -------
+        ClassGraph
+            graph of the current classes and relations
+        """
+        return ClassGraph(self.classes, self.relations)
+
+    def subchart(
+        self,
+        root: ClassChart,
+        depth: int = 2,
+        kinds: tuple = None,
+        direction: str = "both",
+        graph: ClassGraph = None,
+    ) -> "UmlChart":
+        """
+        Returns a new uml-chart of the classes reachable from a root class.
+
+        Parameters
+        ----------
+        root : ClassChart
+            class in the center of the new uml-chart
+        depth : int
+            maximal number of relations to the root class (default = 2)
+        kinds : tuple
+            followed and drawn relation kinds like "inheritance", "composition",
+            "dependency" or puml-expressions like "o--" (default = None, all relations)
+        direction : "both", "out" or "in"
+            followed direction of relations (default = "both")
+        graph : ClassGraph
+            reused adjacency indexes for many subcharts (default = None, built from the
+            current classes and relations)
+
+        Returns
+        -------
+        UmlChart
+            uml-chart with the same settings and the reachable classes
+        """
+        graph = graph or self.graph()
+        reached = set(graph.neighborhood(root, depth, kinds, direction))
+
+        value = self._copy_settings()
+        value.classes = [cls for cls in self.classes if cls in reached]
+        value.relations = {
+            pair: rel
+            for pair, rel in self.relations.items()
+            if pair[0] in reached and pair[1] in reached and matches_kind(rel, kinds)
+        }
+        return value
+
+    def partition(
+        self, by: str = "package", max_classes: int = 50, link: str = "{name}.svg"
+    ) -> tuple[dict[str, "UmlChart"], "UmlChart"]:
+        """
+        Splits the uml-chart into several smaller uml-charts and an index chart.
+
+        Classes related to classes of another chart are added as members-less links to
+        that chart.
+
+        Parameters
+        ----------
+        by : "package", "module" or "component"
+            grouping of the classes, components are connected by relations (default =
+            "package")
+        max_classes : int
+            maximal number of classes per chart, larger groups are split (default = 50)
+        link : str
+            hyperlink of a chart with "{name}" as placeholder (default = "{name}.svg")
+
+        Returns
+        -------
+        tuple
+            charts mapped by there names and the index chart linking all of them
+        """
+        return partition(self, by, max_classes, link)
+
+    def draw(
+        self,
+        file: str = "chart.svg",
+        renderer: Renderer | str = None,
+        formats: list[str] = None,
+    ) -> list[str]:
         """
         Generates a svg image (with name of script) of the uml-chart.
 
@@ -98,25 +379,345 @@ class UmlChart:
         ----------
         file : str or path-object
             target directory with name and extension
+        renderer : Renderer, str or None
+            rendering backend for this call (default = None, the chart's renderer)
+        formats : list
+            formats like "svg", "png", "txt" or "puml" (puml-syntax, not rendered)
+            written next to each other with the extension of the file replaced, the
+            puml-syntax is generated once and all formats are rendered concurrently
+            (default = None, a svg image written to the file)
+
+        Returns
+        -------
+        list
+            written files
+        """
+        code = self._emit()
+        if formats is None:
+            self._draw(file, code, renderer)
+            return [file]
+        return self._draw_formats(file, code, renderer, formats)
+
+    async def adraw(
+        self,
+        file: str = "chart.svg",
+        renderer: Renderer | str = None,
+        formats: list[str] = None,
+    ) -> list[str]:
+        """
+        Generates a svg image of the uml-chart without blocking the event loop.
+
+        Parameters
+        ----------
+        file : str or path-object
+            target directory with name and extension
+        renderer : Renderer, str or None
+            rendering backend for this call (default = None, the chart's renderer)
+        formats : list
+            formats like "svg", "png", "txt" or "puml", see "draw" (default = None, a
+            svg image written to the file)
+
+        Returns
+        -------
+        list
+            written files
+        """
+        from asyncio import to_thread
+
+        code = self._emit()
+        if formats is None:
+            await to_thread(self._draw, file, code, renderer)
+            return [file]
+        return await to_thread(self._draw_formats, file, code, renderer, formats)
+
+    @staticmethod
+    async def adraw_many(
+        charts: list[tuple], renderer: Renderer | str = None, limit: int = 4
+    ) -> None:
+        """
+        Generates svg images of several uml-charts concurrently with one shared
+        renderer, so a remote server is requested over pooled connections.
+
+        Parameters
+        ----------
+        charts : [(UmlChart, file)]
+            uml-charts with there target files
+        renderer : Renderer, str or None
+            rendering backend for all charts (default = None, the environment variable
+            "PUML_RENDERER" or "remote")
+        limit : int
+            maximal number of charts rendered at the same time (default = 4)
+        """
+        from asyncio import Semaphore, gather
+
+        renderer, semaphore = get_renderer(renderer), Semaphore(limit)
+
+        async def _adraw(uml: UmlChart, file: str) -> None:
+            """helper function to bound the number of concurrent renderings"""
+            async with semaphore:
+                await uml.adraw(file, renderer)
+
+        await gather(*(_adraw(uml, file) for uml, file in charts))
+
+    def update(
+        self,
+        file: str,
+        manifest: Manifest,
+        renderer: Renderer | str = None,
+        formats: list[str] = None,
+    ) -> bool:
+        """
+        Generates a svg image of the uml-chart only if its puml-syntax or one of the
+        source files of its classes changed since the last recorded drawing.
+
+        Parameters
+        ----------
+        file : str or path-object
+            target directory with name and extension
+        manifest : Manifest
+            recorded state of the drawn images, updated by this call
+        renderer : Renderer, str or None
+            rendering backend for this call (default = None, the chart's renderer)
+        formats : list
+            formats like "svg", "png", "txt" or "puml", see "draw" (default = None, a
+            svg image written to the file)
+
+        Returns
+        -------
+        bool
+            True if the images were drawn, False if they were up to date
         """
-        svg_bytes, _, _, _ = render(str(self), engine="plantuml", format="svg")
-        with open(file, "wb") as f:
-            f.write(svg_bytes)
+        code = self._emit()
+        outputs = [file] if formats is None else list(_outputs(file, formats).values())
+        if not any(manifest.outdated(output, code) for output in outputs):
+            return False
+        if formats is None:
+            self._draw(file, code, renderer)
+        else:
+            self._draw_formats(file, code, renderer, formats)
+        sources = [f for c in self.classes for f in c.files()]
+        for output in outputs:
+            manifest.record(output, code, sources)
+        return True
 
-    def _set_root(self):
+    @staticmethod
+    def draw_many(
+        charts: list[tuple],
+        command: str = None,
+        workers: int = 2,
+        timeout: float = None,
+    ) -> None:
+        """
+        Generates svg images of several uml-charts with long-lived PlantUML processes.
+
+        Parameters
+        ----------
+        charts : [(UmlChart, file)]
+            uml-charts with there target files
+        command : str
+            PlantUML command line or path to "plantuml.jar" (default = None, the
+            environment variable "PUML_PLANTUML" or "plantuml")
+        workers : int
+            number of charts rendered concurrently (default = 2)
+        timeout : float
+            seconds to wait for a single chart (default = None, no timeout)
+        """
+        with RenderSession(command, timeout, workers) as session:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(uml.draw, file, session) for uml, file in charts
+                ]
+                for future in futures:
+                    future.result()
+
+    def save(self, path: str) -> None:
+        """
+        Writes the extracted classes, relations and links to a JSON file, so they can
+        be loaded without importing or parsing the source files.
+
+        Parameters
+        ----------
+        path : str or path-object
+            target file like "model.json", compressed if it ends with ".gz"
+        """
+        model.save(self, path)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        renderer: Renderer | str = None,
+        cache: RenderCache = None,
+        stats: Stats = None,
+    ) -> "UmlChart":
+        """
+        Reads a uml-chart written by "save" without extracting any class.
+
+        Parameters
+        ----------
+        path : str or path-object
+            JSON file like "model.json" or "model.json.gz"
+        renderer : Renderer, str or None
+            rendering backend (default = None, the environment variable
+            "PUML_RENDERER" or "remote")
+        cache : RenderCache or None
+            on-disk cache of rendered images (default = None)
+        stats : Stats or None
+            recorder of the wall time and counters per stage (default = None)
+
+        Returns
+        -------
+        UmlChart
+            uml-chart with the saved root module, classes, relations and links
+
+        Examples
+        --------
+        >>> from puml.src import UmlChart
+        >>> from puml.src.model import outdated
+        >>> if outdated("model.json"): # a source file changed
+        ...     build_chart().save("model.json")
+        >>> UmlChart.load("model.json", renderer="local").draw("chart.svg")
+        """
+        value = cls(renderer=renderer, cache=cache, stats=stats)
+        with value.stats.stage("load") as record:
+            model.from_dict(model.read(path), value)
+            record["classes"] = len(value.classes)
+        return value
+
+    def _copy_settings(self) -> "UmlChart":
+        """helper method to create an empty uml-chart with the same settings"""
+        return UmlChart(
+            self.root, self.renderer, self.cache, Stats(self.stats.callback)
+        )
+
+    def _emit(self) -> str:
+        """helper method to generate the puml-syntax of a drawing"""
+        with self.stats.stage("emit", classes=len(self.classes)) as record:
+            code = str(self)
+            record["bytes"] = len(code.encode())
+        return code
+
+    def _parse(self, file: str) -> ParsedModule:
+        """helper method to parse a source file ahead of the extraction"""
+        hits = parse_cache.hits
+        with self.stats.stage("parse", files=1) as record:
+            source = parse_cache.get(file)
+            record["bytes"] = source.size
+            record["hits"] = parse_cache.hits - hits
+        return source
+
+    def _draw(
+        self,
+        file: str,
+        code: str,
+        renderer: Renderer | str = None,
+        format: str = "svg",
+    ) -> None:
+        """helper method to render the puml-syntax into an image"""
+        renderer = get_renderer(renderer or self.renderer)
+        with self.stats.stage("render") as record:
+            if self.cache is not None:
+                key = self.cache.key(code, format, renderer)
+                if self.cache.fetch(key, file):
+                    record.update(hits=1, misses=0)
+                    return
+                record.update(hits=0, misses=1)
+
+            image = renderer.render(code, format)
+            # replaces the file, it may be a hardlink to a cached image
+            with open(f"{file}.tmp", "wb") as f:
+                f.write(image)
+            replace(f"{file}.tmp", file)
+            record["bytes"] = len(image)
+            if self.cache is not None:
+                self.cache.store(key, image)
+
+    def _draw_formats(
+        self, file: str, code: str, renderer: Renderer | str, formats: list[str]
+    ) -> list[str]:
+        """helper method to write the puml-syntax and render several formats"""
+        renderer = get_renderer(renderer or self.renderer)
+        files = _outputs(file, formats)
+        if "puml" in files:
+            with open(files["puml"], "w") as f:
+                f.write(wrap(code))
+
+        images = [(files[format], format) for format in files if format != "puml"]
+        if len(images) > 1:
+            with ThreadPoolExecutor(max_workers=len(images)) as executor:
+                futures = [
+                    executor.submit(self._draw, path, code, renderer, format)
+                    for path, format in images
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            for path, format in images:
+                self._draw(path, code, renderer, format)
+        return list(files.values())
+
+    def _add_modules(
+        self, modules: list, workers: int = None, inherited: bool = False
+    ) -> list[ClassChart]:
+        """helper method to extract the classes of several modules file by file"""
+        files: dict[str, dict[str, tuple]] = {}
+        types: dict[tuple, type] = {}
+        with self.stats.stage("locate") as record:
+            for module in modules:
+                for _, cls in getmembers(module, isclass):
+                    if cls.__module__ != module.__name__:
+                        continue
+                    kind = "abstract" if isabstract(cls) else "class"
+                    types[(cls.__module__, cls.__qualname__)] = cls
+                    files.setdefault(getfile(cls), {})[cls.__qualname__] = (
+                        cls.__module__,
+                        kind,
+                    )
+            record["files"] = len(files)
+        values = self._extract_files(list(files.items()), workers)
+        if inherited:
+            with self.stats.stage("extract", classes=0):
+                for value in values:
+                    value.add_inherited(types[(value.module, value.qualname)])
+        return values
+
+    def _extract_files(
+        self, jobs: list[tuple], workers: int = None
+    ) -> list[ClassChart]:
+        """helper method to extract the classes of several source files"""
+        if workers is not None and workers > 1 and len(jobs) > 1:
+            # imported lazily, multiprocessing is only needed for parallel extraction
+            from concurrent.futures import ProcessPoolExecutor
+
+            # parsing happens in the workers and is recorded as extraction
+            with self.stats.stage("extract", files=len(jobs)) as record:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(extract_classes, *zip(*jobs)))
+                record["classes"] = sum(len(result) for result in results)
+        else:
+            results = []
+            for job in jobs:
+                source = self._parse(job[0])
+                with self.stats.stage("extract", files=1) as record:
+                    results.append(extract_classes(*job, source=source))
+                    record["classes"] = len(results[-1])
+
+        values = [value for result in results for value in result]
+        self.classes.extend(values)
+        return values
+
+    def _set_root(self, module: str) -> str:
         """helper method to packing uml chart according to specified root package"""
+        if self.root:
+            parents = module.split(".")
+            if parents.count(self.root) == 1:
+                return ".".join(parents[parents.index(self.root) + 1 :])
+        return ""
 
-        def _set_new_parents(old_name: str) -> str:
-            """helper function to get new module parents"""
-            if self.root:
-                parents = old_name.split(".")
-                if parents.count(self.root) == 1:
-                    return ".".join(parents[parents.index(self.root) + 1 :])
-                return ""
-            return ""
 
-        for cls in self.classes:
-            cls.module = _set_new_parents(cls.module)
+def _outputs(file: str, formats: list[str]) -> dict[str, str]:
+    """helper function to replace the extension of a target file per format"""
+    return {format: f"{splitext(file)[0]}.{format}" for format in formats}
 
 
 if __name__ == "__main__":
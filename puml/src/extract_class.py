@@ -4,9 +4,8 @@ code by the usage of the ast-package.
 """
 
 from ast import (
-    parse,
-    walk,
     AST,
+    NodeVisitor,
     ClassDef,
     FunctionDef,
     Assign,
@@ -15,22 +14,34 @@ from ast import (
     Name,
     Subscript,
     Tuple,
-    Constant,
 )
 from inspect import getfile
+from typing import Iterator
+from weakref import WeakKeyDictionary
+from os import stat
+from os.path import abspath, dirname, isfile, join, relpath, splitext, sep
 
 from puml.src import logger
+from puml.src.annotation import format_annotation
+from puml.src.member import Member
+from puml.src.parse_cache import parse_cache, ParsedModule
 
 
 class ClassChart:
     """
     Collection of all members in a target-class with there corresponding uml-expression.
 
+    Instances are identified by module path, qualified name and kind. The hash is
+    computed once at construction, so instances are cheap keys of relations.
+
     Parameters
     ----------
     cls : type
     kind : str
-
+    inherited : bool
+        adds the members of the base classes (default = False)
+    source : ParsedModule
+        parsed source file of the class (default = None, looked up in the parse cache)
 
     Attributes
     ----------
@@ -38,164 +49,455 @@ class ClassChart:
         Name of the passed type-object
     kind : "abstract", "class" or "interface"
         Name of uml-class-diagramm-type
-    attributes : {"name": "puml syntax"}
-        Names of attributes and properties mapped to there uml-expressions
-    methods : {"name": "puml syntax"}
-        Names of attributes and properties mapped to there uml-expressions
+    attributes : {"name": Member}
+        Names of attributes and properties mapped to there member records
+    methods : {"name": Member}
+        Names of methods mapped to there member records
+    qualname : str
+        Qualified name of the passed type-object like "Outer.Inner"
     module : str
         Module path of the passed type-object
+    file : str
+        Path of the source file defining the passed type-object
+    bases : (str, ...)
+        Formatted base classes of the passed type-object
+    inherited : (ClassChart, ...)
+        Charts of the base classes along the method resolution order, there members
+        are drawn below the own members if not overridden
     """
 
-    def __init__(self, cls: type, kind: str = None):
-        self.name: str = cls.__name__
+    def __init__(
+        self,
+        cls: type,
+        kind: str = None,
+        inherited: bool = False,
+        source: ParsedModule = None,
+    ):
+        # get considered class
+        source = source or parse_cache.get(getfile(cls))
+        self._setup(cls.__name__, cls.__qualname__, cls.__module__, kind, source.path)
+        try:
+            class_node = source.classes[cls.__qualname__]
+        except KeyError:
+            raise LookupError(
+                f"Class <{cls.__qualname__}> is not defined in <{source.path}>"
+            ) from None
+
+        self._extract(class_node)
+        if inherited:
+            self.add_inherited(cls)
+
+    @classmethod
+    def from_source(
+        cls, path: str, class_name: str, kind: str = None, root: str = None
+    ) -> "ClassChart":
+        """
+        Extracts a class chart statically from a source file without importing it.
+
+        Parameters
+        ----------
+        path : str or path-object
+            source file containing the target class
+        class_name : str
+            qualified name of the target class (like "Outer.Inner" for nested classes)
+        kind : "abstract", "class" or "interface"
+        root : str or path-object
+            source root the module path is resolved against (default = None, the
+            topmost directory of the package containing the file)
+
+        Returns
+        -------
+        ClassChart
+            target class as ClassChart instance
+        """
+        path = abspath(path)
+        source = parse_cache.get(path)
+        try:
+            class_node = source.classes[class_name]
+        except KeyError:
+            raise LookupError(
+                f"Class <{class_name}> is not defined in <{source.path}>"
+            ) from None
+        return cls._from_node(
+            class_node, class_name, module_name(path, root), kind, path
+        )
+
+    @classmethod
+    def _from_node(
+        cls,
+        node: ClassDef,
+        qualname: str,
+        module: str,
+        kind: str = None,
+        file: str = None,
+    ) -> "ClassChart":
+        """helper constructor to extract a class chart from its syntax tree node"""
+        obj = cls.__new__(cls)
+        obj._setup(node.name, qualname, module, kind, file)
+        obj._extract(node)
+        return obj
+
+    def add_inherited(self, cls: type) -> None:
+        """
+        Adds the members of all base classes along the method resolution order. Every
+        base class is extracted once and shared by all of its subclasses.
+
+        Parameters
+        ----------
+        cls : type
+            passed type-object
+        """
+        charts = (base_chart(base) for base in cls.__mro__[1:] if base is not object)
+        self.inherited = tuple(chart for chart in charts if chart is not None)
+
+    def files(self) -> list[str]:
+        """
+        Returns the source files of the class and of its inherited members.
+
+        Returns
+        -------
+        list
+            paths of the source files without duplicates
+        """
+        files = (self.file, *(base.file for base in self.inherited))
+        return list(dict.fromkeys(file for file in files if file))
+
+    def update(self, source: ParsedModule = None) -> None:
+        """
+        Extracts the members again from the current state of the source file. The
+        identity is kept, so the instance stays a valid key of existing relations.
+        Shared charts of inherited members are updated on there own.
+
+        Parameters
+        ----------
+        source : ParsedModule
+            parsed source file (default = None, looked up in the parse cache)
+        """
+        source = source or parse_cache.get(self.file)
+        try:
+            class_node = source.classes[self.qualname]
+        except KeyError:
+            raise LookupError(
+                f"Class <{self.qualname}> is not defined in <{source.path}>"
+            ) from None
+        self.attributes, self.methods = {}, {}
+        self._extract(class_node)
+
+    def _setup(
+        self, name: str, qualname: str, module: str, kind: str, file: str
+    ) -> None:
+        """helper method to initialize the instance attributes"""
+        self.name: str = name
+        self.qualname: str = qualname
         self.attributes: dict = {}
         self.methods: dict = {}
         self.kind: str = kind if kind in ("class", "interface", "abstract") else "class"
-        self.module: str = cls.__module__
+        self.module: str = module
+        self.file: str = file
+        self.bases: tuple = ()
+        self.inherited: tuple = ()
+        # identity is independent of the members, so it stays stable on updates
+        self._identity: tuple = (module, qualname, self.kind)
+        self._hash: int = hash(self._identity)
 
-        # get considered class
-        with open(getfile(cls), "r") as file:
-            tree = parse(file.read())
-            for node in tree.body:
-                if isinstance(node, ClassDef) and node.name == self.name:
-                    class_node = node
-
-        # get attributes and methods
+    def _extract(self, class_node: ClassDef) -> None:
+        """helper method to get attributes and methods from the class node"""
+        self.bases = tuple(format_annotation(base) for base in class_node.bases)
+        visitor = AttributeVisitor(self)
         for node in class_node.body:
             self._add_attribute(node, is_class_level=True)
             if isinstance(node, FunctionDef):
                 self._add_method(node)
-                for subnode in walk(node):
-                    self._add_attribute(subnode)
+                visitor.generic_visit(node)
 
     def __hash__(self):
         """hash-method to use instances as key in a dictionary"""
-        return_tuple = (
-            self.name,
-            frozenset(self.attributes.items()),
-            frozenset(self.methods.items()),
-            self.kind,
-        )
-        return hash(return_tuple)
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        """equality-method consistent with the hash-method"""
+        if not isinstance(other, ClassChart):
+            return NotImplemented
+        return self._hash == other._hash and self._identity == other._identity
+
+    def __getstate__(self) -> dict:
+        """pickle-method without the hash, it depends on the hash seed of the process"""
+        state = self.__dict__.copy()
+        del state["_hash"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """unpickle-method recomputing the hash in the current process"""
+        self.__dict__.update(state)
+        self._hash = hash(self._identity)
 
     def __repr__(self) -> str:
         """representation-method to print puml-syntax"""
+        return "\n".join(self.iter_lines())
+
+    def iter_lines(self, module: str = None) -> Iterator[str]:
+        """
+        Yields the puml-syntax of the class line by line.
+
+        Parameters
+        ----------
+        module : str
+            displayed module path (default = None, the module path of the class)
 
-        def _handle_members(members: dict, add_private: bool = False) -> str:
+        Yields
+        ------
+        str
+            line of puml-syntax without line break
+        """
+
+        def _handle_members(members: dict, add_private: bool = False) -> Iterator[str]:
             """helper function to ignore private members"""
-            value = ""
-            if len(members) != 0:
-                for member in members.values():
-                    if not (member[0] == "_" or "}_" in member) or add_private:
-                        value += f"\n\t+{member}"
-            return value
-
-        return (
-            f"{self.kind} {self.module}.{self.name} {{"
-            f"{_handle_members(self.attributes)}"
-            f"{_handle_members(self.methods)}"
-            f"\n}}"
-        )
+            for member in members.values():
+                if member.visibility == "+" or add_private:
+                    yield f"\t+{member}"
+
+        module = self.module if module is None else module
+        yield f"{self.kind} {module}.{self.name} {{"
+        yield from _handle_members(self.attributes)
+        yield from _handle_members(self.methods)
+
+        # inherited members, overridden ones are drawn by the first class defining them
+        drawn = {*self.attributes, *self.methods}
+        for base in self.inherited:
+            members = {
+                name: member
+                for name, member in (*base.attributes.items(), *base.methods.items())
+                if name not in drawn
+            }
+            drawn.update(members)
+            lines = list(_handle_members(members))
+            if lines:
+                yield f"\t-- {base.name} --"
+                yield from lines
+        yield "}"
 
     def _add_attribute(self, node: AST, is_class_level: bool = False) -> None:
         """helper method to update attribute-dictionary of instance"""
 
-        def _get_name(arg: AST):
-            """helper function to extract attribute name from syntax tree"""
-            if isinstance(arg, Subscript):
-                return _get_name(arg.value)
-            elif isinstance(arg, Tuple):
-                return [name for n in arg.elts for name in _get_name(n)]
-            elif (
-                isinstance(arg, Attribute)
-                and isinstance(arg.value, Name)
-                and arg.value.id == "self"
-            ):
-                return [arg.attr]
-            elif isinstance(arg, Name) and is_class_level:
-                return [arg.id]
-            else:
-                return []
-
         # sets names and annotations or _add_attribute() call ends (returns)
         if isinstance(node, Assign):
             for target in node.targets:
-                names = _get_name(target)
-                annotations = ["EMPTY"] * len(names)
+                names = _get_names(target, is_class_level)
+                annotations = [None] * len(names)
         elif isinstance(node, AnnAssign):
-            names, annotations = _get_name(node.target), [node.annotation]
+            names = _get_names(node.target, is_class_level)
+            annotations = [node.annotation]
         else:
             return
 
-        # adds names and annotations to attribute-dictionary
+        # adds names and annotations to attribute-dictionary, known types are kept
         for name, annotation in zip(names, annotations):
-            value = f"{name}: {self._format_type(annotation)}"
-            if name in self.attributes:
-                if self.attributes[name].count("EMPTY") >= value.count("EMPTY"):
-                    self.attributes[name] = value
-            else:
+            value = Member(name, type=self._get_type(annotation))
+            existing = self.attributes.get(name)
+            if existing is None or existing.type is None or value.type is not None:
                 self.attributes[name] = value
 
     def _add_method(self, node: FunctionDef) -> None:
         """helper method to update method-dictionary of instance"""
 
         # sets kind according decorator
-        kind, decorators = "", ("staticmethod", "classmethod")
+        kind, decorators = "method", ("staticmethod", "classmethod")
         for subnode in node.decorator_list:
             if isinstance(subnode, Name):
-                kind = "{static}" if subnode.id in decorators else f"{{{subnode.id}}}"
+                kind = "static" if subnode.id in decorators else subnode.id
             elif isinstance(subnode, Attribute):
-                kind = "{property}"
+                kind = "property"
+
+        # sets return annotations
+        returns = self._get_type(node.returns)
 
-        # sets argument names and annotations
-        arguments = ", ".join(
-            [
-                f"{arg.arg}: {self._format_type(arg.annotation)}"
+        # adds attribute(property) or method to dictionaries depending on kind
+        if kind == "property":
+            if not (node.name in self.attributes and returns in (None, "None")):
+                self.attributes[node.name] = Member(node.name, kind, returns)
+        else:
+            params = tuple(
+                (arg.arg, self._get_type(arg.annotation))
                 for arg in node.args.args
                 if arg.arg != "self"
-            ]
-        )
+            )
+            self.methods[node.name] = Member(
+                node.name, kind, params=params, returns=returns
+            )
 
-        # sets return annotations
-        if isinstance(node.returns, Constant):
-            returns = node.returns.value
-        else:
-            returns = self._format_type(node.returns)
+    def _get_type(self, node: AST) -> str:
+        """helper method to format annotations, None if missing"""
+        return None if node is None else format_annotation(node)
 
-        # adds attribute(property) or method to dictionaries depending on kind
-        if kind == "{property}":
-            value = f"{node.name}: {returns}"
-            if not (
-                node.name in self.attributes
-                and any(t in value for t in ("None", "EMPTY"))
-            ):
-                self.attributes[node.name] = value
+
+class AttributeVisitor(NodeVisitor):
+    """
+    Visitor of the statements in a method body which can assign instance attributes.
+
+    Only statement lists are traversed, expressions are never entered. Nested classes
+    and nested functions with an own "self" parameter are pruned, because "self" refers
+    to another instance there.
+
+    Parameters
+    ----------
+    chart : ClassChart
+        class chart the found attributes are added to
+    """
+
+    def __init__(self, chart: ClassChart):
+        self.chart = chart
+
+    def visit_Assign(self, node: Assign) -> None:
+        self.chart._add_attribute(node)
+
+    visit_AnnAssign = visit_Assign
+
+    def visit_FunctionDef(self, node: FunctionDef) -> None:
+        if not any(arg.arg == "self" for arg in node.args.args):
+            self.generic_visit(node)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node: ClassDef) -> None:
+        pass
+
+    def generic_visit(self, node: AST) -> None:
+        for field in ("body", "orelse", "finalbody", "handlers", "cases"):
+            for child in getattr(node, field, ()):
+                self.visit(child)
+
+
+def _get_names(arg: AST, is_class_level: bool = False) -> list[str]:
+    """helper function to extract attribute names from syntax tree"""
+    if isinstance(arg, Subscript):
+        return _get_names(arg.value, is_class_level)
+    elif isinstance(arg, Tuple):
+        return [name for n in arg.elts for name in _get_names(n, is_class_level)]
+    elif (
+        isinstance(arg, Attribute)
+        and isinstance(arg.value, Name)
+        and arg.value.id == "self"
+    ):
+        return [arg.attr]
+    elif isinstance(arg, Name) and is_class_level:
+        return [arg.id]
+    else:
+        return []
+
+
+def extract_classes(
+    path: str,
+    targets: dict[str, tuple] = None,
+    module: str = None,
+    source: ParsedModule = None,
+) -> list[ClassChart]:
+    """
+    Extracts several classes from one source file, which is parsed only once.
+
+    Parameters
+    ----------
+    path : str
+        path of the source file
+    targets : {"qualified name": (module, kind)}
+        qualified names of the target classes mapped to there module path and kind
+        (default = None, all top-level classes of the file)
+    module : str
+        module path of the classes if no targets are passed (default = None, resolved
+        from the file path)
+    source : ParsedModule
+        parsed source file (default = None, looked up in the parse cache)
+
+    Returns
+    -------
+    list
+        ClassChart instances in order of definition in the source file
+    """
+    source = source or parse_cache.get(path)
+    if targets is None:
+        module = module_name(path) if module is None else module
+        targets = {
+            qualname: (module, "class")
+            for qualname in source.classes
+            if "." not in qualname
+        }
+    return [
+        ClassChart._from_node(node, qualname, *targets[qualname], source.path)
+        for qualname, node in source.classes.items()
+        if qualname in targets
+    ]
+
+
+# base classes mapped to the file state there shared chart was extracted from, weak
+# keys release dynamically created classes
+_base_charts: WeakKeyDictionary[type, tuple] = WeakKeyDictionary()
+
+
+def base_chart(base: type) -> ClassChart:
+    """
+    Extracts the own members of a base class once, shared by all subclasses. The
+    shared chart is updated in place when the source file of the base class changed.
+
+    Parameters
+    ----------
+    base : type
+        base class
+
+    Returns
+    -------
+    ClassChart or None
+        base class as ClassChart instance, None if its source is not available like for
+        builtins
+    """
+    try:
+        path = getfile(base)
+        state = stat(path)
+        cached = _base_charts.get(base)
+        if cached is not None and cached[:2] == (state.st_mtime_ns, state.st_size):
+            return cached[2]
+        source = parse_cache.get(path)
+        if cached is None:
+            chart = ClassChart(base, source=source)
         else:
-            self.methods[node.name] = f"{kind}{node.name}({arguments})" f" -> {returns}"
-
-    def _format_type(self, node: AST) -> str:
-        """helper method to extract annotations from syntax tree"""
-
-        # handles typing annotation like Union, Tuple, etc.
-        if isinstance(node, Subscript):
-            base_type = node.value.id
-            if isinstance(node.slice, Tuple):
-                slice_type = ", ".join([self._format_type(t) for t in node.slice.elts])
-            elif isinstance(node.slice, Subscript):
-                slice_type = self._format_type(node.slice)
-            else:
-                slice_type = node.slice.id
-            return f"{base_type}[{slice_type}]"
-
-        # handles basic annotation
-        elif isinstance(node, Name):
-            return f"{node.id}"
-
-        # handles constant annotations like None
-        elif isinstance(node, Constant):
-            return f"{node.value}"
-
-        return "EMPTY"
+            chart = cached[2]
+            chart.update(source)
+    except (TypeError, OSError, LookupError) as error:
+        logger.debug(f"members of <{base.__qualname__}> are not added: {error}")
+        return None
+    _base_charts[base] = (source.mtime, source.size, chart)
+    return chart
+
+
+def clear_cache() -> None:
+    """Removes the shared charts of all base classes."""
+    _base_charts.clear()
+
+
+def module_name(path: str, root: str = None) -> str:
+    """
+    Resolves the module path of a source file without importing it.
+
+    Parameters
+    ----------
+    path : str or path-object
+        path of the source file
+    root : str or path-object
+        source root the module path is resolved against (default = None, the topmost
+        directory of the package containing the file)
+
+    Returns
+    -------
+    str
+        module path like "package.module"
+    """
+    path = abspath(path)
+    if root is None:
+        root = dirname(path)
+        while isfile(join(root, "__init__.py")):
+            root = dirname(root)
+    parts = splitext(relpath(path, abspath(root)))[0].split(sep)
+    if parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
 
 
 if __name__ == "__main__":
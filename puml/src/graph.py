@@ -0,0 +1,90 @@
+"""
+This module contains the "ClassGraph"-class, adjacency indexes over the classes and
+relations of a uml-chart to select neighborhoods of classes.
+"""
+
+from collections import deque
+
+from puml.src import ClassChart
+from puml.src.relations import RELATIONS
+
+_KINDS = {expression: kind for kind, expression in RELATIONS.items()}
+
+
+class ClassGraph:
+    """
+    Directed graph of class charts with outgoing and incoming adjacency indexes.
+
+    Parameters
+    ----------
+    classes : list
+        ClassChart instances
+    relations : dict
+        the key is tuple of two ClassChart instances and the value is puml-expression
+        for the relation as string
+
+    Attributes
+    ----------
+    outgoing : {ClassChart: [(ClassChart, puml-expression)]}
+        Relations starting at a class
+    incoming : {ClassChart: [(ClassChart, puml-expression)]}
+        Relations ending at a class
+    """
+
+    def __init__(self, classes: list[ClassChart], relations: dict[tuple, str]):
+        self.outgoing: dict[ClassChart, list] = {cls: [] for cls in classes}
+        self.incoming: dict[ClassChart, list] = {cls: [] for cls in classes}
+        for (source, target), expression in relations.items():
+            self.outgoing.setdefault(source, []).append((target, expression))
+            self.incoming.setdefault(target, []).append((source, expression))
+
+    def neighborhood(
+        self,
+        root: ClassChart,
+        depth: int = 2,
+        kinds: tuple = None,
+        direction: str = "both",
+    ) -> list[ClassChart]:
+        """
+        Returns all classes reachable from the root class within depth relations.
+
+        Parameters
+        ----------
+        root : ClassChart
+            start of the breadth-first search
+        depth : int
+            maximal number of relations to the root class (default = 2)
+        kinds : tuple
+            followed relation kinds like "inheritance", "composition", "dependency" or
+            puml-expressions like "o--" (default = None, all relations)
+        direction : "both", "out" or "in"
+            followed direction of relations (default = "both")
+
+        Returns
+        -------
+        list
+            reachable ClassChart instances in breadth-first order starting with the root
+            class
+        """
+        indexes = {
+            "both": (self.outgoing, self.incoming),
+            "out": (self.outgoing,),
+            "in": (self.incoming,),
+        }[direction]
+
+        reached, queue = {root: 0}, deque([root])
+        while queue:
+            cls = queue.popleft()
+            if reached[cls] == depth:
+                continue
+            for index in indexes:
+                for neighbor, expression in index.get(cls, ()):
+                    if neighbor not in reached and matches_kind(expression, kinds):
+                        reached[neighbor] = reached[cls] + 1
+                        queue.append(neighbor)
+        return list(reached)
+
+
+def matches_kind(expression: str, kinds: tuple) -> bool:
+    """Checks if a relation is one of the kinds or puml-expressions (None for all)."""
+    return kinds is None or expression in kinds or _KINDS.get(expression) in kinds
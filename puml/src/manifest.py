@@ -0,0 +1,133 @@
+"""
+This module contains the "Manifest"-class which records the source files every drawn
+uml-chart depends on, so unchanged charts are skipped on regeneration.
+"""
+
+from hashlib import sha256
+from json import dump, load
+from os import replace, stat
+from os.path import abspath, isfile
+
+from puml.src import logger
+
+
+class Manifest:
+    """
+    JSON file mapping drawn images to the state of there source files.
+
+    The manifest maps every output file to the hash of its puml-syntax and the
+    modification time, size and content hash of every source file of its classes.
+    Content hashes are only computed if modification time or size changed.
+
+    Parameters
+    ----------
+    path : str or path-object
+        location of the manifest file (default = "puml-manifest.json")
+
+    Attributes
+    ----------
+    entries : {"output file": {"chart": hash, "sources": {"path": [mtime, size, hash]}}}
+        Recorded state of all drawn images
+
+    Examples
+    --------
+    >>> from puml.src import Manifest
+    >>> manifest = Manifest("build/puml-manifest.json")
+    >>> if manifest.outdated("chart.svg"): # skips imports and parsing
+    ...     uml = build_chart()
+    ...     uml.update("chart.svg", manifest)
+    >>> manifest.save()
+    """
+
+    def __init__(self, path: str = "puml-manifest.json"):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        if isfile(path):
+            with open(path, "r") as file:
+                self.entries = load(file)
+
+    def outdated(self, output: str, chart: str = None) -> bool:
+        """
+        Checks if an image has to be drawn again.
+
+        Parameters
+        ----------
+        output : str or path-object
+            target directory with name and extension
+        chart : str
+            puml-syntax of the chart (default = None, only source files are checked)
+
+        Returns
+        -------
+        bool
+            True if the image, one of its source files or the puml-syntax changed
+        """
+        output = abspath(output)
+        entry = self.entries.get(output)
+        if entry is None or not isfile(output):
+            return True
+        if chart is not None and entry["chart"] != _hash(chart.encode()):
+            return True
+        for path, state in entry["sources"].items():
+            if not isfile(path):
+                return True
+            current = file_state(path, state)
+            if current[2] != state[2]:
+                logger.debug(f"<{path}> changed since <{output}> was drawn")
+                return True
+            # only touched, avoids hashing the file again
+            entry["sources"][path] = current
+        return False
+
+    def record(self, output: str, chart: str, sources: list[str]) -> None:
+        """
+        Records the state of a drawn image.
+
+        Parameters
+        ----------
+        output : str or path-object
+            target directory with name and extension
+        chart : str
+            puml-syntax of the chart
+        sources : list
+            paths of the source files of the chart
+        """
+        self.entries[abspath(output)] = {
+            "chart": _hash(chart.encode()),
+            "sources": {path: file_state(path) for path in sorted(set(sources))},
+        }
+
+    def save(self) -> None:
+        """Writes the manifest file atomically."""
+        with open(f"{self.path}.tmp", "w") as file:
+            dump(self.entries, file, indent=1, sort_keys=True)
+        replace(f"{self.path}.tmp", self.path)
+
+
+def _hash(data: bytes) -> str:
+    """helper function to hash contents"""
+    return sha256(data).hexdigest()
+
+
+def file_state(path: str, previous: list = None) -> list:
+    """
+    Returns the modification time, size and content hash of a file.
+
+    Parameters
+    ----------
+    path : str
+        path of the file
+    previous : list
+        earlier state of the file, returned without hashing if modification time and
+        size are unchanged (default = None)
+
+    Returns
+    -------
+    list
+        modification time in nanoseconds, size in bytes and sha256 hash of the content
+    """
+    state = stat(path)
+    if previous is not None and previous[:2] == [state.st_mtime_ns, state.st_size]:
+        return previous
+    with open(path, "rb") as file:
+        return [state.st_mtime_ns, state.st_size, _hash(file.read())]
@@ -0,0 +1,66 @@
+"""
+This module contains the "Member"-class, a compact record of an extracted attribute,
+property or method, which is formatted to puml-syntax only on output.
+"""
+
+EMPTY = "EMPTY"
+
+
+class Member:
+    """
+    Attribute, property or method of a class.
+
+    Parameters
+    ----------
+    name : str
+    kind : str
+    type : str
+    params : tuple
+    returns : str
+
+    Attributes
+    ----------
+    name : str
+        Name of the member
+    visibility : "+" or "-"
+        Public or private (leading underscore) member
+    kind : "attribute", "property", "method", "static" or decorator name
+        Kind of the member, methods with other decorators are marked by there name
+    type : str or None
+        Annotation of attributes and properties, None if unknown
+    params : ((name, type), ...)
+        Names and annotations of method parameters, annotation None if unknown
+    returns : str or None
+        Return annotation of methods, None if unknown
+    """
+
+    __slots__ = ("name", "visibility", "kind", "type", "params", "returns")
+
+    def __init__(
+        self,
+        name: str,
+        kind: str = "attribute",
+        type: str = None,
+        params: tuple = (),
+        returns: str = None,
+    ):
+        self.name = name
+        self.visibility = "-" if name[0] == "_" else "+"
+        self.kind = kind
+        self.type = type
+        self.params = params
+        self.returns = returns
+
+    def __repr__(self) -> str:
+        """representation-method to print puml-syntax"""
+        if self.kind in ("attribute", "property"):
+            return f"{self.name}: {self.type or EMPTY}"
+
+        prefix = {"method": "", "static": "{static}"}.get(self.kind, f"{{{self.kind}}}")
+        params = ", ".join(f"{name}: {type or EMPTY}" for name, type in self.params)
+        return f"{prefix}{self.name}({params}) -> {self.returns or EMPTY}"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Member):
+            return NotImplemented
+        return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
@@ -0,0 +1,196 @@
+"""
+This module contains the serialization of extracted uml-charts to JSON, so one
+extraction can be reused by many rendering processes or later builds without importing
+or parsing any source file.
+"""
+
+from gzip import open as gzip_open
+from json import dump, load
+from os import replace
+from os.path import isfile
+
+from puml.src import logger, ClassChart, Member
+from puml.src.manifest import file_state
+
+# version of the serialized format, older files are rejected
+FORMAT = 2
+
+
+def to_dict(uml) -> dict:
+    """
+    Converts a uml-chart to JSON-serializable data.
+
+    Classes are stored once in a table, relations, links and inherited members refer
+    to there index.
+
+    Parameters
+    ----------
+    uml : UmlChart
+        uml-chart to convert
+
+    Returns
+    -------
+    dict
+        data with the keys "format", "root", "table", "classes", "links", "relations"
+        and "sources"
+    """
+    index: dict[ClassChart, int] = {}
+
+    def _index(cls: ClassChart) -> int:
+        """helper function to add a class to the table once"""
+        if cls not in index:
+            index[cls] = len(index)
+        return index[cls]
+
+    classes = [_index(cls) for cls in uml.classes]
+    links = [[_index(cls), link] for cls, link in uml.links.items()]
+    relations = [
+        [_index(source), _index(target), rel]
+        for (source, target), rel in uml.relations.items()
+    ]
+    for cls in list(index):
+        for base in cls.inherited:
+            _index(base)
+    files = sorted({f for cls in uml.classes for f in cls.files() if isfile(f)})
+    return {
+        "format": FORMAT,
+        "root": uml.root,
+        "table": [_class_to_list(cls, index) for cls in index],
+        "classes": classes,
+        "links": links,
+        "relations": relations,
+        "sources": {file: file_state(file) for file in files},
+    }
+
+
+def from_dict(data: dict, uml) -> None:
+    """
+    Adds the classes, links and relations of converted data to an empty uml-chart.
+
+    Parameters
+    ----------
+    data : dict
+        data returned by "to_dict"
+    uml : UmlChart
+        empty uml-chart, its root module is replaced
+    """
+    if data.get("format") != FORMAT:
+        raise ValueError(f"Format <{data.get('format')}> is not supported")
+
+    table = [_class_from_list(values) for values in data["table"]]
+    for cls, values in zip(table, data["table"]):
+        cls.inherited = tuple(table[i] for i in values[8])
+    uml.root = data["root"]
+    uml.classes = [table[i] for i in data["classes"]]
+    uml.links = {table[i]: link for i, link in data["links"]}
+    uml.relations = {(table[i], table[j]): rel for i, j, rel in data["relations"]}
+
+
+def save(uml, path: str) -> None:
+    """
+    Writes a uml-chart atomically to a JSON file, compressed if the path ends with
+    ".gz".
+
+    Parameters
+    ----------
+    uml : UmlChart
+        uml-chart to write
+    path : str or path-object
+        target file like "model.json" or "model.json.gz"
+    """
+    path = str(path)
+    with _open(path, f"{path}.tmp", "wt") as file:
+        dump(to_dict(uml), file, separators=(",", ":"))
+    replace(f"{path}.tmp", path)
+    logger.debug(f"saved {len(uml.classes)} classes to <{path}>")
+
+
+def read(path: str) -> dict:
+    """
+    Reads the data of a uml-chart written by "save".
+
+    Parameters
+    ----------
+    path : str or path-object
+        JSON file like "model.json" or "model.json.gz"
+
+    Returns
+    -------
+    dict
+        data of the uml-chart
+    """
+    path = str(path)
+    with _open(path, path, "rt") as file:
+        return load(file)
+
+
+def outdated(path: str) -> bool:
+    """
+    Checks if a saved uml-chart has to be extracted again.
+
+    Parameters
+    ----------
+    path : str or path-object
+        JSON file written by "save"
+
+    Returns
+    -------
+    bool
+        True if the file is missing, has another format or one of the source files of
+        its classes changed
+    """
+    if not isfile(path):
+        return True
+    data = read(path)
+    if data.get("format") != FORMAT:
+        return True
+    for file, state in data["sources"].items():
+        if not isfile(file) or file_state(file, state)[2] != state[2]:
+            logger.debug(f"<{file}> changed since <{path}> was saved")
+            return True
+    return False
+
+
+def _open(path: str, file: str, mode: str):
+    """helper function to open a file compressed if the path ends with ".gz" """
+    if path.endswith(".gz"):
+        return gzip_open(file, mode, encoding="utf-8")
+    return open(file, mode[0], encoding="utf-8")
+
+
+def _class_to_list(cls: ClassChart, index: dict) -> list:
+    """helper function to convert a class chart to a compact list"""
+    return [
+        cls.name,
+        cls.qualname,
+        cls.module,
+        cls.kind,
+        cls.file,
+        list(cls.bases),
+        [_member_to_list(m) for m in cls.attributes.values()],
+        [_member_to_list(m) for m in cls.methods.values()],
+        [index[base] for base in cls.inherited],
+    ]
+
+
+def _class_from_list(values: list) -> ClassChart:
+    """helper function to create a class chart from a compact list without parsing"""
+    name, qualname, module, kind, file, bases, attributes, methods, _ = values
+    cls = ClassChart.__new__(ClassChart)
+    cls._setup(name, qualname, module, kind, file)
+    cls.bases = tuple(bases)
+    cls.attributes = {m.name: m for m in map(_member_from_list, attributes)}
+    cls.methods = {m.name: m for m in map(_member_from_list, methods)}
+    return cls
+
+
+def _member_to_list(member: Member) -> list:
+    """helper function to convert a member to a compact list"""
+    params = [list(param) for param in member.params]
+    return [member.name, member.kind, member.type, params, member.returns]
+
+
+def _member_from_list(values: list) -> Member:
+    """helper function to create a member from a compact list"""
+    name, kind, type, params, returns = values
+    return Member(name, kind, type, tuple(map(tuple, params)), returns)
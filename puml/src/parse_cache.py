@@ -0,0 +1,150 @@
+"""
+This module contains the "ParseCache"-class to share parsed syntax trees of source files
+between ClassChart instances, so every file is read and parsed only once.
+"""
+
+from ast import parse, AST, Module, ClassDef, FunctionDef, AsyncFunctionDef
+from collections import OrderedDict
+from os import stat
+
+from puml.src import logger
+
+
+class ParsedModule:
+    """
+    Parsed source file with the file state it was parsed from.
+
+    Parameters
+    ----------
+    path : str
+    mtime : int
+    size : int
+    tree : ast.Module
+
+    Attributes
+    ----------
+    path : str
+        Path of the parsed source file
+    mtime : int
+        Modification time of the source file in nanoseconds at parsing time
+    size : int
+        Size of the source file in bytes at parsing time
+    tree : ast.Module
+        Syntax tree of the source file
+    classes : {"qualified name": ast.ClassDef}
+        Qualified names of all classes (including nested ones like "Outer.Inner") mapped
+        to there syntax tree nodes
+    """
+
+    __slots__ = ("path", "mtime", "size", "tree", "classes")
+
+    def __init__(self, path: str, mtime: int, size: int, tree: Module):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.tree = tree
+        self.classes: dict[str, ClassDef] = {}
+        self._index_classes(tree, "")
+
+    def _index_classes(self, node: AST, prefix: str) -> None:
+        """helper method to map qualified class names to there nodes in one pass"""
+        for field in ("body", "orelse", "handlers", "finalbody"):
+            for child in getattr(node, field, ()):
+                if isinstance(child, ClassDef):
+                    qualname = f"{prefix}{child.name}"
+                    self.classes[qualname] = child
+                    self._index_classes(child, f"{qualname}.")
+                elif isinstance(child, (FunctionDef, AsyncFunctionDef)):
+                    self._index_classes(child, f"{prefix}{child.name}.<locals>.")
+                elif isinstance(child, AST):
+                    # blocks like "if TYPE_CHECKING:" do not change the qualified name
+                    self._index_classes(child, prefix)
+
+
+class ParseCache:
+    """
+    Least recently used cache of parsed source files keyed by file path.
+
+    Entries are validated against modification time and size of the file on every
+    lookup, so edited files are parsed again.
+
+    Parameters
+    ----------
+    maxsize : int
+        maximal number of cached files (default = 128)
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximal number of cached files
+    hits : int
+        Number of lookups answered from the cache
+    misses : int
+        Number of lookups which required parsing the file
+
+    Examples
+    --------
+    >>> from puml.src import parse_cache
+    >>> tree = parse_cache.get("my_module.py").tree
+    >>> parse_cache.hits, parse_cache.misses
+    (0, 1)
+    >>> parse_cache.clear()
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[str, ParsedModule] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def get(self, path: str) -> ParsedModule:
+        """
+        Returns the parsed source file, parses it only if not cached or outdated.
+
+        Parameters
+        ----------
+        path : str
+            path of the source file
+
+        Returns
+        -------
+        ParsedModule
+            parsed source file
+        """
+        state = stat(path)
+        entry = self._entries.get(path)
+        if (
+            entry is not None
+            and entry.mtime == state.st_mtime_ns
+            and entry.size == state.st_size
+        ):
+            self.hits += 1
+            self._entries.move_to_end(path)
+            return entry
+
+        self.misses += 1
+        logger.debug(f"parsing <{path}>")
+        with open(path, "r") as file:
+            entry = ParsedModule(
+                path, state.st_mtime_ns, state.st_size, parse(file.read())
+            )
+        self._entries[path] = entry
+        self._entries.move_to_end(path)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        """Removes all cached files and resets the hit/miss counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+parse_cache = ParseCache()
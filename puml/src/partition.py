@@ -0,0 +1,95 @@
+"""
+This module contains the partitioning of a large uml-chart into charts per package,
+module or connected component, so every rendering stays small.
+"""
+
+from puml.src import logger, ClassChart
+from puml.src.graph import ClassGraph
+
+
+def partition(uml, by: str = "package", max_classes: int = 50, link="{name}.svg"):
+    """
+    Splits a uml-chart into several smaller uml-charts and an index chart.
+
+    Parameters
+    ----------
+    uml : UmlChart
+        uml-chart to split
+    by : "package", "module" or "component"
+        grouping of the classes (default = "package")
+    max_classes : int
+        maximal number of classes per chart, larger groups are split (default = 50)
+    link : str
+        hyperlink of a chart with "{name}" as placeholder (default = "{name}.svg")
+
+    Returns
+    -------
+    tuple
+        charts mapped by there names and the index chart linking all of them
+    """
+    # groups classes and splits large groups into chunks
+    names: dict[ClassChart, str] = {}
+    for name, group in _group(uml, by).items():
+        chunks = [group[i : i + max_classes] for i in range(0, len(group), max_classes)]
+        for i, chunk in enumerate(chunks):
+            chunk_name = name if len(chunks) == 1 else f"{name}_{i + 1}"
+            for cls in chunk:
+                names[cls] = chunk_name
+
+    charts: dict[str, object] = {}
+    for cls in uml.classes:
+        charts.setdefault(names[cls], uml._copy_settings()).classes.append(cls)
+
+    # adds relations, foreign classes are linked to there chart
+    index, nodes, crossings = uml._copy_settings(), {}, {}
+    for name in charts:
+        nodes[name] = _node(name)
+        index.links[nodes[name]] = link.format(name=name)
+
+    for (source, target), rel in uml.relations.items():
+        if source not in names or target not in names:
+            continue
+        source_name, target_name = names[source], names[target]
+        charts[source_name].relations[(source, target)] = rel
+        if source_name != target_name:
+            charts[source_name].links[target] = link.format(name=target_name)
+            charts[target_name].links[source] = link.format(name=source_name)
+            charts[target_name].relations[(source, target)] = rel
+            crossings[(nodes[source_name], nodes[target_name])] = "..>"
+
+    index.relations = crossings
+    logger.debug(f"partitioned {len(uml.classes)} classes into {len(charts)} charts")
+    return charts, index
+
+
+def _group(uml, by: str) -> dict[str, list[ClassChart]]:
+    """helper function to group the classes of a uml-chart"""
+    groups: dict[str, list[ClassChart]] = {}
+    if by in ("package", "module"):
+        for cls in uml.classes:
+            name = cls.module if by == "module" else cls.module.rpartition(".")[0]
+            groups.setdefault(name or cls.module, []).append(cls)
+
+    elif by == "component":
+        graph, grouped = ClassGraph(uml.classes, uml.relations), set()
+        classes = set(uml.classes)
+        for cls in uml.classes:
+            if cls in grouped:
+                continue
+            # breadth-first order keeps related classes in the same chunk
+            component = [
+                c for c in graph.neighborhood(cls, len(uml.classes)) if c in classes
+            ]
+            grouped.update(component)
+            groups[f"component_{len(groups) + 1}"] = component
+
+    else:
+        raise ValueError(f"Partitioning by <{by}> is unknown")
+    return groups
+
+
+def _node(name: str) -> ClassChart:
+    """helper function to create a member-less class chart representing a chart"""
+    node = ClassChart.__new__(ClassChart)
+    node._setup(name.replace(".", "_"), name, "", "class", None)
+    return node
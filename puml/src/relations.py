@@ -0,0 +1,99 @@
+"""
+This module contains the inference of relations between class charts from there base
+classes and member annotations.
+"""
+
+from functools import lru_cache
+from re import compile
+
+from puml.src import logger, ClassChart
+
+# relation kinds mapped to there puml-expressions, ordered by priority
+RELATIONS = {
+    "inheritance": "--|>",
+    "composition": "*--",
+    "dependency": "..>",
+}
+
+_IDENTIFIER = compile(r"[A-Za-z_][\w.]*")
+
+
+def find_relations(
+    classes: list[ClassChart], kinds: tuple = tuple(RELATIONS)
+) -> dict[tuple, str]:
+    """
+    Derives relations between class charts in linear time over there members.
+
+    Base classes result in inheritance, attribute annotations in composition and
+    parameter and return annotations in dependency relations. Only one relation is
+    derived per pair, the one with the highest priority.
+
+    Parameters
+    ----------
+    classes : list
+        ClassChart instances
+    kinds : tuple
+        considered relation kinds (default = ("inheritance", "composition",
+        "dependency"))
+
+    Returns
+    -------
+    dict
+        the key is tuple of two ClassChart instances and the value is puml-expression
+        for the relation as string
+    """
+    index = _Index(classes)
+    relations: dict[tuple, str] = {}
+
+    def _add(source: ClassChart, annotations, kind: str) -> None:
+        """helper function to add relations to all classes named in the annotations"""
+        if kind not in kinds:
+            return
+        for annotation in annotations:
+            for name in _names(annotation):
+                target = index.get(name, source)
+                if target is not None and target is not source:
+                    relations.setdefault((source, target), RELATIONS[kind])
+
+    for cls in classes:
+        _add(cls, (base.split("[")[0] for base in cls.bases), "inheritance")
+        _add(cls, (m.type for m in cls.attributes.values() if m.type), "composition")
+        for method in cls.methods.values():
+            _add(cls, (t for _, t in method.params if t), "dependency")
+            _add(cls, (method.returns,) if method.returns else (), "dependency")
+
+    logger.debug(f"inferred {len(relations)} relations of {len(classes)} classes")
+    return relations
+
+
+class _Index:
+    """helper class to look up class charts by name, qualified name or full path"""
+
+    def __init__(self, classes: list[ClassChart]):
+        self._names: dict[str, list[ClassChart]] = {}
+        for cls in classes:
+            for key in {cls.name, cls.qualname, f"{cls.module}.{cls.qualname}"}:
+                self._names.setdefault(key, []).append(cls)
+
+    def get(self, name: str, source: ClassChart) -> ClassChart:
+        """
+        Returns the named class, preferring the module of the source class. Dotted
+        names missing in the index like "models.User" of "import pkg.models as models"
+        are shortened from the left down to the last component.
+        """
+        candidates = self._names.get(name)
+        while not candidates and "." in name:
+            name = name.split(".", 1)[1]
+            candidates = self._names.get(name)
+        if not candidates:
+            return None
+        for cls in candidates:
+            if cls.module == source.module:
+                return cls
+        return candidates[0]
+
+
+@lru_cache(maxsize=4096)
+def _names(annotation: str) -> tuple[str, ...]:
+    """helper function to get the identifiers of a formatted annotation"""
+    return tuple(_IDENTIFIER.findall(annotation))
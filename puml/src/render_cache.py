@@ -0,0 +1,168 @@
+"""
+This module contains the "RenderCache"-class, an on-disk cache of rendered images keyed by
+the hash of the puml-syntax, the image format and the rendering backend.
+"""
+
+from hashlib import sha256
+from os import (
+    chmod,
+    environ,
+    link,
+    listdir,
+    makedirs,
+    remove,
+    replace,
+    stat,
+    umask,
+    utime,
+)
+from os.path import expanduser, isfile, join
+from shutil import copyfile
+from tempfile import NamedTemporaryFile
+
+from puml.src import logger
+from puml.src.renderer import Renderer
+
+TEMP = ".tmp-"
+
+# permissions of a regularly created file, temporary files are only readable by the
+# owner, but cached images are published as hardlinks (umask is read by setting it)
+MODE = 0o666 & ~umask(umask(0o022))
+
+
+class RenderCache:
+    """
+    Content-addressed directory of rendered images with least recently used eviction.
+
+    Parameters
+    ----------
+    directory : str or path-object
+        cache directory (default = None, the environment variable "PUML_CACHE_DIR" or
+        "~/.cache/puml")
+    maxsize : int
+        maximal size of all cached images in bytes (default = 100 MB)
+    link : bool
+        hardlinks cached images to the target files instead of copying them (default =
+        False)
+
+    Attributes
+    ----------
+    hits : int
+        Number of images taken from the cache
+    misses : int
+        Number of images which had to be rendered
+
+    Examples
+    --------
+    >>> from puml.src import RenderCache, UmlChart
+    >>> uml = UmlChart(cache=RenderCache("build/.puml-cache"))
+    >>> uml.draw("chart.svg") # renders and stores the image
+    >>> uml.draw("chart.svg") # copies the stored image
+    """
+
+    def __init__(self, directory: str = None, maxsize: int = 100 * 2**20, link=False):
+        self.directory = expanduser(
+            directory or environ.get("PUML_CACHE_DIR", "~/.cache/puml")
+        )
+        self.maxsize = maxsize
+        self.link = link
+        self.hits: int = 0
+        self.misses: int = 0
+        makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(code: str, format: str, renderer: Renderer) -> str:
+        """
+        Returns the cache key of an image.
+
+        Parameters
+        ----------
+        code : str
+            puml-syntax of the chart
+        format : str
+            image format like "svg" or "png"
+        renderer : Renderer
+            rendering backend
+
+        Returns
+        -------
+        str
+            hex digest identifying the image
+        """
+        value = sha256(f"{renderer.cache_key()}\0{format}\0".encode())
+        value.update(code.encode())
+        return f"{value.hexdigest()}.{format}"
+
+    def fetch(self, key: str, file: str) -> bool:
+        """
+        Writes a cached image to the target file.
+
+        Parameters
+        ----------
+        key : str
+            cache key of the image
+        file : str or path-object
+            target directory with name and extension
+
+        Returns
+        -------
+        bool
+            True if the image was cached, False otherwise
+        """
+        path = join(self.directory, key)
+        if not isfile(path):
+            self.misses += 1
+            return False
+
+        self.hits += 1
+        utime(path)
+        if self.link:
+            try:
+                if isfile(file):
+                    remove(file)
+                link(path, file)
+                return True
+            except OSError:
+                logger.debug(f"hardlinking <{path}> failed, copying instead")
+        copyfile(path, file)
+        return True
+
+    def store(self, key: str, data: bytes) -> None:
+        """
+        Stores a rendered image atomically and evicts the least recently used images.
+
+        Parameters
+        ----------
+        key : str
+            cache key of the image
+        data : bytes
+            rendered image
+        """
+        with NamedTemporaryFile(dir=self.directory, prefix=TEMP, delete=False) as file:
+            file.write(data)
+        chmod(file.name, MODE)
+        replace(file.name, join(self.directory, key))
+        self._evict()
+
+    def clear(self) -> None:
+        """Removes all cached images and resets the hit/miss counters."""
+        for name in listdir(self.directory):
+            if not name.startswith(TEMP):
+                remove(join(self.directory, name))
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self) -> None:
+        """helper method to remove the least recently used images above maxsize"""
+        entries = []
+        for name in listdir(self.directory):
+            if name.startswith(TEMP):
+                continue
+            state = stat(join(self.directory, name))
+            entries.append((state.st_mtime_ns, state.st_size, name))
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, name in sorted(entries):
+            if size <= self.maxsize:
+                break
+            remove(join(self.directory, name))
+            size -= entry_size
@@ -0,0 +1,213 @@
+"""
+This module contains the renderer classes which convert puml-syntax into images. The
+backend of a UmlChart is selected by name, instance or the environment variable
+"PUML_RENDERER".
+"""
+
+from os import environ
+from posixpath import join
+from shlex import split
+from subprocess import run
+from threading import Lock
+
+from puml.src import logger
+
+
+class Renderer:
+    """
+    Interface of all rendering backends.
+
+    Attributes
+    ----------
+    name : str
+        Name of the backend used for the selection by name
+    """
+
+    name: str = None
+
+    def render(self, code: str, format: str = "svg") -> bytes:
+        """
+        Renders puml-syntax into an image.
+
+        Parameters
+        ----------
+        code : str
+            puml-syntax of the chart
+        format : str
+            image format like "svg" or "png" (default = "svg")
+
+        Returns
+        -------
+        bytes
+            rendered image
+        """
+        raise NotImplementedError
+
+    def cache_key(self) -> str:
+        """Returns the identification of the backend for cached images."""
+        return self.name
+
+
+class RemoteRenderer(Renderer):
+    """
+    Renders on a remote PlantUML server over pooled HTTP connections.
+
+    Images are not cached on disk like by "plantweb.render.render", every call requests
+    the server. Pass a RenderCache to the UmlChart to reuse rendered images.
+
+    Parameters
+    ----------
+    server : str
+        url of the PlantUML server (default = None, the environment variable
+        "PUML_SERVER" or the plantweb default server)
+    connections : int
+        maximal number of kept-alive connections to the server (default = 10)
+    timeout : float
+        seconds to wait for the server (default = None, no timeout)
+    """
+
+    name = "remote"
+
+    def __init__(
+        self, server: str = None, connections: int = 10, timeout: float = None
+    ):
+        # imported lazily, plantweb and requests dominate the import time of puml
+        from plantweb.defaults import read_defaults
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+
+        self.server = server or environ.get("PUML_SERVER") or read_defaults()["server"]
+        self.timeout = timeout
+        self._session = Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=connections)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def render(self, code: str, format: str = "svg") -> bytes:
+        from plantweb.plantuml import compress_and_encode
+
+        url = join(self.server, format, compress_and_encode(wrap(code)))
+        logger.debug(f"requesting <{url[:80]}>")
+        response = self._session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.content
+
+    def cache_key(self) -> str:
+        return f"{self.name}:{self.server}"
+
+
+class LocalRenderer(Renderer):
+    """
+    Renders with a local PlantUML executable or jar-file in a subprocess.
+
+    Parameters
+    ----------
+    command : str
+        PlantUML command line or path to "plantuml.jar" (default = None, the
+        environment variable "PUML_PLANTUML" or "plantuml")
+    timeout : float
+        seconds until the subprocess is stopped (default = None, no timeout)
+    """
+
+    name = "local"
+
+    def __init__(self, command: str = None, timeout: float = None):
+        command = command or environ.get("PUML_PLANTUML", "plantuml")
+        self.command: list = (
+            ["java", "-jar", command] if command.endswith(".jar") else split(command)
+        )
+        self.timeout = timeout
+
+    def render(self, code: str, format: str = "svg") -> bytes:
+        logger.debug(f"rendering with <{' '.join(self.command)}>")
+        result = run(
+            [*self.command, "-pipe", f"-t{format}"],
+            input=wrap(code).encode(),
+            capture_output=True,
+            timeout=self.timeout,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"PlantUML failed with exit code {result.returncode}: "
+                f"{result.stderr.decode(errors='replace').strip()}"
+            )
+        return result.stdout
+
+    def cache_key(self) -> str:
+        return f"{self.name}:{' '.join(self.command)}"
+
+
+class FakeRenderer(Renderer):
+    """
+    Records all rendering calls without rendering for testing reasons.
+
+    Parameters
+    ----------
+    output : bytes
+        returned image (default = None, the encoded puml-syntax)
+
+    Attributes
+    ----------
+    calls : [(code, format)]
+        Arguments of all render calls
+    """
+
+    name = "fake"
+
+    def __init__(self, output: bytes = None):
+        self.output = output
+        self.calls: list[tuple] = []
+
+    def render(self, code: str, format: str = "svg") -> bytes:
+        self.calls.append((code, format))
+        return code.encode() if self.output is None else self.output
+
+
+renderers: dict[str, type] = {
+    RemoteRenderer.name: RemoteRenderer,
+    LocalRenderer.name: LocalRenderer,
+    FakeRenderer.name: FakeRenderer,
+}
+
+
+# renderer instances created by name, keyed by name and environment configuration
+_instances: dict[tuple, Renderer] = {}
+_lock = Lock()
+
+
+def get_renderer(renderer=None) -> Renderer:
+    """
+    Returns a renderer instance. Backends selected by name are created once and
+    reused by later calls.
+
+    Parameters
+    ----------
+    renderer : Renderer, str or None
+        renderer instance, name of a backend in "renderers" or None to use the
+        environment variable "PUML_RENDERER" (default = "remote")
+
+    Returns
+    -------
+    Renderer
+        renderer instance
+    """
+    if isinstance(renderer, Renderer):
+        return renderer
+    name = renderer or environ.get("PUML_RENDERER", RemoteRenderer.name)
+    if name not in renderers:
+        raise ValueError(
+            f"Renderer <{name}> is unknown, choose one of {list(renderers)}"
+        )
+    # shared per backend and configuration, so connections are pooled across calls
+    key = (name, environ.get("PUML_SERVER"), environ.get("PUML_PLANTUML"))
+    with _lock:
+        if key not in _instances:
+            _instances[key] = renderers[name]()
+        return _instances[key]
+
+
+def wrap(code: str) -> str:
+    """helper function to enclose puml-syntax with @startuml and @enduml"""
+    if "@startuml" in code:
+        return code if code.endswith("\n") else f"{code}\n"
+    return f"@startuml\n{code}\n@enduml\n"
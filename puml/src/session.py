@@ -0,0 +1,193 @@
+"""
+This module contains the "RenderSession"-class which keeps PlantUML processes in pipe
+mode alive, so batches of charts are rendered without starting a JVM per chart.
+"""
+
+from queue import Queue, Empty
+from subprocess import Popen, PIPE, DEVNULL
+from threading import Lock, Thread
+from time import monotonic
+
+from puml.src import logger
+from puml.src.renderer import LocalRenderer, wrap
+
+DELIMITER = b"__PUML_END_OF_DIAGRAM__"
+
+
+class PipeProcess:
+    """
+    PlantUML process rendering all diagrams streamed to its standard input.
+
+    Parameters
+    ----------
+    command : list
+        PlantUML command line
+    format : str
+        image format like "svg" or "png"
+    """
+
+    def __init__(self, command: list, format: str):
+        self.format = format
+        self.process = Popen(
+            [*command, "-pipe", f"-t{format}", "-pipedelimitor", DELIMITER.decode()],
+            stdin=PIPE,
+            stdout=PIPE,
+            stderr=DEVNULL,
+        )
+        self._chunks: Queue = Queue()
+        self._buffer = bytearray()
+        Thread(target=self._read, daemon=True).start()
+
+    def _read(self) -> None:
+        """helper method to collect the output in a background thread"""
+        for chunk in iter(lambda: self.process.stdout.read1(65536), b""):
+            self._chunks.put(chunk)
+        self._chunks.put(None)
+
+    def _split(self) -> bytes:
+        """helper method to take an image ending with the delimiter from the buffer"""
+        # PlantUML writes the delimiter directly after the image, not on a new line
+        start = self._buffer.find(DELIMITER)
+        end = self._buffer.find(b"\n", start + len(DELIMITER))
+        if start < 0 or end < 0:
+            return None
+        image = bytes(self._buffer[:start])
+        del self._buffer[: end + 1]
+        return image
+
+    def render(self, code: str, timeout: float = None) -> bytes:
+        """
+        Renders one diagram.
+
+        Parameters
+        ----------
+        code : str
+            puml-syntax of the chart
+        timeout : float
+            seconds to wait for the image (default = None, no timeout)
+
+        Returns
+        -------
+        bytes
+            rendered image
+        """
+        self.process.stdin.write(wrap(code).encode())
+        self.process.stdin.flush()
+
+        deadline = None if timeout is None else monotonic() + timeout
+        image = self._split()
+        while image is None:
+            remaining = None if deadline is None else max(deadline - monotonic(), 0)
+            try:
+                chunk = self._chunks.get(timeout=remaining)
+            except Empty:
+                raise TimeoutError(
+                    f"PlantUML did not answer within {timeout} seconds"
+                ) from None
+            if chunk is None:
+                raise RuntimeError(
+                    f"PlantUML stopped with exit code {self.process.wait()}"
+                )
+            self._buffer += chunk
+            image = self._split()
+        return image
+
+    def close(self, timeout: float = 5) -> None:
+        """Stops the process, kills it if it does not finish in time."""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout)
+        except Exception:
+            self.process.kill()
+            self.process.wait()
+
+
+class RenderSession(LocalRenderer):
+    """
+    Pool of long-lived PlantUML processes as context manager.
+
+    Parameters
+    ----------
+    command : str
+        PlantUML command line or path to "plantuml.jar" (default = None, the
+        environment variable "PUML_PLANTUML" or "plantuml")
+    timeout : float
+        seconds to wait for a single diagram (default = None, no timeout)
+    workers : int
+        maximal number of processes per image format (default = 2)
+
+    Examples
+    --------
+    >>> from puml.src import RenderSession
+    >>> with RenderSession(workers=4, timeout=30) as session:
+    ...     uml_a.draw("a.svg", renderer=session)
+    ...     uml_b.draw("b.svg", renderer=session)
+    """
+
+    name = "session"
+
+    def __init__(self, command: str = None, timeout: float = None, workers: int = 2):
+        super().__init__(command, timeout)
+        self.workers = workers
+        self._idle: dict[str, Queue] = {}
+        self._started: dict[str, int] = {}
+        self._processes: list[PipeProcess] = []
+        self._lock = Lock()
+
+    def __enter__(self) -> "RenderSession":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def render(self, code: str, format: str = "svg") -> bytes:
+        process = self._acquire(format)
+        try:
+            output = process.render(code, self.timeout)
+        except Exception:
+            self._discard(process)
+            raise
+        self._idle[format].put(process)
+        return output
+
+    def close(self) -> None:
+        """Stops all processes of the session."""
+        with self._lock:
+            processes, self._processes = self._processes, []
+            self._idle.clear()
+            self._started.clear()
+        for process in processes:
+            process.close()
+
+    def _acquire(self, format: str) -> PipeProcess:
+        """helper method to get an idle process or start a new one within the limit"""
+        while True:
+            with self._lock:
+                idle = self._idle.setdefault(format, Queue())
+                if idle.empty() and self._started.get(format, 0) < self.workers:
+                    logger.debug(f"starting PlantUML process for <{format}>")
+                    process = PipeProcess(self.command, format)
+                    self._started[format] = self._started.get(format, 0) + 1
+                    self._processes.append(process)
+                    return process
+            process = idle.get()
+            # None releases a waiting thread after a replacement failed to start
+            if process is not None:
+                return process
+
+    def _discard(self, process: PipeProcess) -> None:
+        """helper method to replace a failed or timed out process"""
+        process.process.kill()
+        process.process.wait()
+        with self._lock:
+            self._processes.remove(process)
+            try:
+                replacement = PipeProcess(self.command, process.format)
+            except Exception as error:
+                logger.warning(f"PlantUML process is not replaced: {error}")
+                self._started[process.format] -= 1
+                replacement = None
+            else:
+                self._processes.append(replacement)
+        # waiting threads take over the replacement or start a new process
+        self._idle[process.format].put(replacement)
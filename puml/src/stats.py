@@ -0,0 +1,117 @@
+"""
+This module contains the "Stats"-class recording wall time and counters of every stage
+of a uml-chart, from locating and parsing source files to rendering the image.
+"""
+
+from contextlib import contextmanager
+from json import dumps
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Iterator
+
+
+class Stats:
+    """
+    Accumulated wall time and counters per stage of a uml-chart.
+
+    Every record adds one call, its wall time and arbitrary counters like "bytes",
+    "files", "classes", "hits" or "misses" to the totals of the stage. Recording costs a
+    clock reading and a few dictionary updates, so it is always enabled.
+
+    Stages of UmlChart
+    ------------------
+    locate   finding the source files of imported classes (inspect.getfile)
+    parse    reading and parsing source files, "hits" of the parse cache
+    extract  extracting the members of the classes
+    emit     generating the puml-syntax
+    render   rendering the image, "hits" and "misses" of the render cache
+    load     reading a saved uml-chart instead of the stages up to extraction
+
+    Parameters
+    ----------
+    callback : callable
+        called with the stage name and the counters of every single record, e.g. to
+        forward them to a metrics system (default = None)
+
+    Attributes
+    ----------
+    stages : {"stage": {"calls": int, "seconds": float, ...}}
+        Accumulated counters per stage in order of there first record
+    callback : callable or None
+        Called on every record
+
+    Examples
+    --------
+    >>> from puml.src import UmlChart
+    >>> uml = UmlChart()
+    >>> uml.add_class(MyClass)
+    >>> uml.draw("chart.svg")
+    >>> uml.stats.stages["parse"]
+    {'calls': 1, 'seconds': 0.0012, 'files': 1, 'bytes': 5123, 'hits': 0}
+    >>> uml.stats.to_json()
+    """
+
+    def __init__(self, callback: Callable[[str, dict], None] = None):
+        self.stages: dict[str, dict] = {}
+        self.callback = callback
+        self._lock = Lock()
+
+    def __repr__(self):
+        return self.to_json()
+
+    def add(self, stage: str, seconds: float = 0.0, **counts: int) -> None:
+        """
+        Adds a record to the totals of a stage.
+
+        Parameters
+        ----------
+        stage : str
+            name of the stage like "parse" or "render"
+        seconds : float
+            wall time of the record (default = 0.0)
+        counts : int
+            counters of the record like bytes=1024
+        """
+        with self._lock:
+            totals = self.stages.setdefault(stage, {"calls": 0, "seconds": 0.0})
+            totals["calls"] += 1
+            totals["seconds"] += seconds
+            for name, count in counts.items():
+                totals[name] = totals.get(name, 0) + count
+        if self.callback is not None:
+            self.callback(stage, {"seconds": seconds, **counts})
+
+    @contextmanager
+    def stage(self, stage: str, **counts: int) -> Iterator[dict]:
+        """
+        Records the wall time of the enclosed block.
+
+        Parameters
+        ----------
+        stage : str
+            name of the stage like "parse" or "render"
+        counts : int
+            initial counters, the yielded dictionary can be updated within the block
+
+        Yields
+        ------
+        dict
+            counters of the record
+        """
+        start = perf_counter()
+        yield counts
+        self.add(stage, perf_counter() - start, **counts)
+
+    def clear(self) -> None:
+        """Removes all records."""
+        with self._lock:
+            self.stages.clear()
+
+    def to_dict(self) -> dict[str, dict]:
+        """Returns a copy of the counters per stage."""
+        with self._lock:
+            return {stage: dict(totals) for stage, totals in self.stages.items()}
+
+    def to_json(self, indent: int = None) -> str:
+        """Returns the counters per stage as JSON."""
+        return dumps(self.to_dict(), indent=indent)
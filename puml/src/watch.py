@@ -0,0 +1,176 @@
+"""
+This module contains the "Watcher"-class which polls the source files of drawn
+uml-charts and draws a chart again as soon as one of its source files changed.
+"""
+
+from os import stat
+from subprocess import SubprocessError
+from threading import Event
+from time import perf_counter, sleep
+
+from puml.src import logger
+from puml.src.renderer import Renderer
+
+
+class Watcher:
+    """
+    Polling watcher of the source files behind the classes of several uml-charts.
+
+    A change re-parses only the changed file, extracts the members of its classes
+    (including base classes of inherited members) again in place and draws only the
+    charts containing one of these classes. Changes are debounced, so saving several
+    files at once results in one drawing per chart. Only classes already in a chart are
+    updated, new classes of a changed file are not added.
+
+    Parameters
+    ----------
+    charts : [(UmlChart, file)] or [(UmlChart, file, formats)]
+        uml-charts with there target files and optionally formats like "svg", "png"
+        or "puml", see "UmlChart.draw"
+    renderer : Renderer, str or None
+        rendering backend for all charts (default = None, the chart's renderer)
+    interval : float
+        seconds between two polls (default = 0.1)
+    debounce : float
+        seconds without further changes before drawing (default = 0.2)
+
+    Attributes
+    ----------
+    charts : [(UmlChart, file)] or [(UmlChart, file, formats)]
+        Watched uml-charts with there target files and formats
+    states : {"path": (mtime, size)}
+        Last seen state of every watched source file, None if missing
+
+    Examples
+    --------
+    >>> from puml.src import UmlChart
+    >>> from puml.src.watch import Watcher
+    >>> uml = UmlChart()
+    >>> uml.add_path("src/mypackage")
+    >>> uml.draw("chart.svg")
+    >>> Watcher([(uml, "chart.svg")], renderer="local").run() # until interrupted
+    """
+
+    def __init__(
+        self,
+        charts: list[tuple],
+        renderer: Renderer | str = None,
+        interval: float = 0.1,
+        debounce: float = 0.2,
+    ):
+        self.charts = charts
+        self.renderer = renderer
+        self.interval = interval
+        self.debounce = debounce
+        self.states: dict[str, tuple] = self._snapshot()
+
+    def changes(self) -> set[str]:
+        """
+        Returns the source files changed since the last call.
+
+        Returns
+        -------
+        set
+            paths of changed, created or removed source files
+        """
+        states = self._snapshot()
+        changed = {
+            path
+            for path, state in states.items()
+            if path not in self.states or self.states[path] != state
+        }
+        self.states = states
+        return changed
+
+    def refresh(self, files: set[str]) -> list[str]:
+        """
+        Updates the classes defined in source files and draws the affected charts.
+        Charts failing to draw are logged and drawn again on the next poll.
+
+        Parameters
+        ----------
+        files : set
+            paths of changed source files
+
+        Returns
+        -------
+        list
+            target files of the drawn charts
+        """
+        start, updated, drawn = perf_counter(), set(), []
+        for uml, output, *formats in self.charts:
+            affected = [cls for cls in uml.classes if not files.isdisjoint(cls.files())]
+            # inherited members come from shared base charts, updated only once
+            charts = [c for cls in affected for c in (cls, *cls.inherited)]
+            for cls in charts:
+                # equal charts of separately built uml-charts are distinct instances
+                if cls.file not in files or id(cls) in updated:
+                    continue
+                try:
+                    source = uml._parse(cls.file)
+                    with uml.stats.stage("extract", classes=1):
+                        cls.update(source)
+                except (LookupError, OSError, SyntaxError) as error:
+                    # keeps the last state until the file is valid again
+                    logger.warning(f"<{cls.qualname}> is not updated: {error}")
+                updated.add(id(cls))
+            if not affected:
+                continue
+            try:
+                uml.draw(output, self.renderer, *formats)
+                drawn.append(output)
+            except (OSError, RuntimeError, SubprocessError) as error:
+                logger.error(f"<{output}> is not drawn: {error}")
+                # forgets the seen states, so the next poll retries the chart
+                for file in files.intersection(f for c in affected for f in c.files()):
+                    self.states.pop(file, None)
+        logger.info(f"drew {drawn} in {perf_counter() - start:.3f}s")
+        return drawn
+
+    def poll(self) -> list[str]:
+        """
+        Checks the source files once and draws the affected charts after the changes
+        settled.
+
+        Returns
+        -------
+        list
+            target files of the drawn charts
+        """
+        changed = self.changes()
+        if not changed:
+            return []
+        while True:
+            sleep(self.debounce)
+            more = self.changes()
+            if not more:
+                break
+            changed |= more
+        return self.refresh(changed)
+
+    def run(self, stop: Event = None) -> None:
+        """
+        Polls the source files until the stop event is set.
+
+        Parameters
+        ----------
+        stop : threading.Event
+            ends the watching when set (default = None, watches until interrupted)
+        """
+        stop = stop or Event()
+        logger.info(f"watching {len(self.states)} source files")
+        while not stop.wait(self.interval):
+            self.poll()
+
+    def _snapshot(self) -> dict[str, tuple]:
+        """helper method to get the state of all source files of the watched charts"""
+        states = {}
+        for uml, *_ in self.charts:
+            for file in (f for cls in uml.classes for f in cls.files()):
+                if file not in states:
+                    try:
+                        state = stat(file)
+                        states[file] = (state.st_mtime_ns, state.st_size)
+                    except OSError:
+                        states[file] = None
+        return states
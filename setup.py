@@ -8,5 +8,6 @@ setup(
     packages=find_packages(
         include=["puml", "puml.*", "src", "src.*", "example", "example.*"]
     ),
-    install_requires=["plantweb>=1.3.0"]
+    install_requires=["plantweb>=1.3.0"],
+    entry_points={"console_scripts": ["puml = puml.src.cli:main"]},
 )
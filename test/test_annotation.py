@@ -0,0 +1,44 @@
+from ast import parse
+
+import pytest
+
+from puml.src.annotation import (
+    format_annotation,
+    clear_cache,
+    _format_forward_reference,
+)
+
+
+def _format(source: str) -> str:
+    return format_annotation(parse(source, mode="eval").body)
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("int", "int"),
+        ("Optional[List[Union[int, float]]]", "Optional[List[Union[int, float]]]"),
+        ("np.ndarray", "np.ndarray"),
+        ("npt.NDArray[np.float64]", "npt.NDArray[np.float64]"),
+        ("int | None", "int | None"),
+        ("'MockCore'", "MockCore"),
+        ("List['MockCore']", "List[MockCore]"),
+        ("Callable[[int, str], bool]", "Callable[[int, str], bool]"),
+        ("Tuple[int, ...]", "Tuple[int, ...]"),
+        ("Literal[1, 'a']", "Literal[1, 'a']"),
+        ("'not valid ('", "not valid ("),
+    ],
+)
+def test_format_annotation(source, expected):
+    assert _format(source) == expected
+
+
+def test_format_missing_annotation():
+    assert format_annotation(None) == "EMPTY"
+
+
+def test_forward_references_memoized():
+    clear_cache()
+    _format("Optional['MockCore']")
+    _format("List['MockCore']")
+    assert _format_forward_reference.cache_info().hits == 1
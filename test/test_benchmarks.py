@@ -0,0 +1,22 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BENCHMARKS = Path(__file__).parent.parent / "benchmarks"
+
+
+def test_throughput_benchmark(tmp_path):
+    output = tmp_path / "run.json"
+    command = [sys.executable, BENCHMARKS / "throughput.py", "-n", "4", "-m", "4"]
+    command += ["-f", "2", "-r", "1", "-o", output]
+    subprocess.run(command, check=True, capture_output=True)
+
+    report = json.loads(output.read_text())
+    assert list(report["stages"]) == ["parse", "extract", "repr", "draw"]
+    assert all(stage["peak_bytes"] > 0 for stage in report["stages"].values())
+
+    result = subprocess.run(
+        command[:-2] + ["-b", output, "-t", "1000"], capture_output=True
+    )
+    assert result.returncode == 0
@@ -0,0 +1,44 @@
+import json
+
+from puml.src.cli import main
+
+
+def test_main(tmp_path, capsys):
+    (tmp_path / "module.py").write_text(
+        "class A:\n    pass\n\nclass B(A):\n    attr: 'C'\n\nclass C:\n    pass\n"
+    )
+    config = {
+        "renderer": "fake",
+        "charts": {
+            "static": {
+                "output": str(tmp_path / "out" / "static.svg"),
+                "paths": [str(tmp_path / "module.py")],
+                "relations": [["A", "C", "..>"]],
+                "infer_relations": True,
+            },
+            "imported": {
+                "output": str(tmp_path / "imported.svg"),
+                "classes": ["test.conftest.MockCore"],
+            },
+        },
+    }
+    (tmp_path / "puml.json").write_text(json.dumps(config))
+
+    stats = tmp_path / "stats.json"
+    assert main([str(tmp_path / "puml.json"), "-w", "2", "-s", str(stats)]) == 0
+    stages = json.loads(stats.read_text())["imported"]
+    assert stages["extract"]["classes"] == 1 and stages["emit"]["calls"] == 1
+    code = (tmp_path / "out" / "static.svg").read_text()
+    assert "B --|> A" in code and "B *-- C" in code and "A ..> C" in code
+    assert (tmp_path / "imported.svg").exists()
+
+    report = capsys.readouterr().out.splitlines()
+    assert report[0].split() == ["chart", "classes", "extract", "emit", "render"]
+    assert report[1].split()[:2] == ["static", "3"]
+
+
+def test_main_print_single_chart(tmp_path, capsys):
+    config = {"charts": {"a": {"classes": ["test.conftest.MockCore"]}, "b": {}}}
+    (tmp_path / "puml.json").write_text(json.dumps(config))
+    assert main([str(tmp_path / "puml.json"), "--print", "--chart", "a"]) == 0
+    assert "MockCore" in capsys.readouterr().out
@@ -0,0 +1,156 @@
+import json
+from io import StringIO
+
+import pytest
+
+import puml.example
+import test
+from puml.example import classes
+from puml.src import FakeRenderer, Stats, UmlChart
+
+
+def test_add_module():
+    uml = UmlChart()
+    values = uml.add_module(classes)
+    assert [v.name for v in values] == ["Source", "Warning", "SymLink", "Core"]
+    assert uml.classes == values
+    assert all(v.module == "puml.example.classes" for v in values)
+
+
+def test_add_package_pattern():
+    uml = UmlChart()
+    values = uml.add_package(puml.example, pattern="*.classes")
+    assert {v.name for v in values} == {"Source", "Warning", "SymLink", "Core"}
+
+
+def test_add_package_workers():
+    serial, parallel = UmlChart(), UmlChart()
+    serial.add_package(test, pattern="test.*")
+    parallel.add_package(test, pattern="test.*", workers=2)
+    assert len(serial.classes) > 0
+    assert str(serial) == str(parallel)
+
+
+def test_add_path(tmp_path):
+    package = tmp_path / "package"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "module.py").write_text(
+        "import not_installed\n\n"
+        "class A:\n    def __init__(self):\n        self.attr: int = 0\n\n"
+        "    class Nested:\n        pass\n\n"
+        "class B(A):\n    pass\n"
+    )
+    uml = UmlChart()
+    values = uml.add_path(tmp_path)
+    assert [(v.module, v.name) for v in values] == [
+        ("package.module", "A"),
+        ("package.module", "B"),
+    ]
+    assert str(values[0].attributes["attr"]) == "attr: int"
+
+
+def test_write_to_matches_repr():
+    uml = UmlChart(root_module="puml")
+    values = uml.add_module(classes)
+    uml.add_relation(values[0], values[1], "..>")
+    stream = StringIO()
+    uml.write_to(stream)
+    assert stream.getvalue() == str(uml)
+    assert "class example.classes.Source {" in list(uml.iter_lines())
+
+
+def test_repr_is_repeatable():
+    uml = UmlChart(root_module="puml")
+    uml.add_module(classes)
+    assert str(uml) == str(uml)
+    assert uml.classes[0].module == "puml.example.classes"
+
+
+def test_infer_relations():
+    from test import MockClass, MockCore, MockParent
+
+    uml = UmlChart()
+    cls, core, parent = (uml.add_class(c) for c in (MockClass, MockCore, MockParent))
+    uml.add_relation(cls, core, "o--")
+    uml.infer_relations()
+    assert uml.relations == {(cls, parent): "--|>", (cls, core): "o--"}
+
+    uml.relations.clear()
+    uml.infer_relations(kinds=("composition",))
+    assert uml.relations == {(cls, core): "*--"}
+
+
+def test_infer_dependency(tmp_path):
+    (tmp_path / "module.py").write_text(
+        "class A:\n    pass\n\n"
+        "class B:\n    def method(self, arg: 'A') -> Optional[C]:\n        pass\n\n"
+        "class C(Generic[T]):\n    pass\n"
+    )
+    uml = UmlChart()
+    a, b, c = uml.add_path(tmp_path / "module.py")
+    uml.infer_relations()
+    assert uml.relations == {(b, a): "..>", (b, c): "..>"}
+
+
+def test_infer_dotted_references(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "models.py").write_text(
+        "class Base:\n    pass\n\nclass User:\n    pass\n"
+    )
+    (tmp_path / "pkg" / "views.py").write_text(
+        "import pkg.models as models\n\n"
+        "class View(models.Base):\n    user: models.User\n"
+    )
+    uml = UmlChart()
+    base, user = uml.add_path(tmp_path / "pkg" / "models.py")
+    (view,) = uml.add_path(tmp_path / "pkg" / "views.py")
+    uml.infer_relations()
+    assert uml.relations == {(view, base): "--|>", (view, user): "*--"}
+
+
+def test_subchart(tmp_path):
+    (tmp_path / "module.py").write_text(
+        "class A:\n    pass\n\nclass B(A):\n    pass\n\n"
+        "class C(B):\n    attr: 'D'\n\nclass D:\n    pass\n\nclass E:\n    pass\n"
+    )
+    uml = UmlChart(root_module="module")
+    a, b, c, d, e = uml.add_path(tmp_path / "module.py")
+    uml.infer_relations()
+
+    sub = uml.subchart(b, depth=1)
+    assert sub.classes == [a, b, c] and sub.root == "module"
+    assert sub.relations == {(b, a): "--|>", (c, b): "--|>"}
+
+    sub = uml.subchart(d, depth=3, kinds=("composition",))
+    assert sub.classes == [c, d]
+    assert uml.subchart(c, depth=5, direction="out").classes == [a, b, c, d]
+    assert uml.subchart(e).classes == [e]
+
+
+def test_stats(tmp_path):
+    records = []
+    stats = Stats(lambda stage, counts: records.append(stage))
+    uml = UmlChart(renderer=FakeRenderer(b"<svg/>"), stats=stats)
+    uml.add_module(classes)
+    uml.add_class(test.MockCore)
+    uml.draw(tmp_path / "chart.svg")
+
+    stages = uml.stats.to_dict()
+    assert list(stages) == ["locate", "parse", "extract", "emit", "render"]
+    assert stages["locate"]["files"] == 2
+    assert stages["extract"]["classes"] == 5
+    assert stages["emit"]["bytes"] == len(str(uml))
+    assert stages["render"]["bytes"] == 6
+    assert records.count("parse") == stages["parse"]["calls"] == 2
+    assert json.loads(uml.stats.to_json()) == stages
+
+
+def test_add_module_inherited():
+    from test import conftest
+
+    uml = UmlChart()
+    values = {v.name: v for v in uml.add_module(conftest, inherited=True)}
+    assert values["MockClass"].inherited == (values["MockParent"],)
+    assert "-- MockParent --" in str(uml)
@@ -1,10 +1,17 @@
+import gc
+import os
+import pickle
+import subprocess
+import sys
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Union, Dict, List, Tuple, Optional
 
 import pytest
 
-from puml.src import ClassChart
-from test import MockCore, MockClass
+from puml.src import ClassChart, parse_cache
+from puml.src.extract_class import _base_charts, base_chart, clear_cache, module_name
+from test import MockCore, MockClass, MockParent
 
 
 class MockVoid:
@@ -28,7 +35,7 @@ def test_init_single_attribute_class():
     assert obj.name == "MockSingleAttribute"
     assert len(obj.attributes) == 1 and len(obj.methods) == 1
     assert all(
-        key == "attr" and "attr" in value for key, value in obj.attributes.items()
+        key == "attr" and "attr" in str(value) for key, value in obj.attributes.items()
     )
     assert obj.kind == "class"
 
@@ -43,7 +50,8 @@ def test_init_single_method_class():
     assert obj.name == "MockSingleMethod"
     assert len(obj.attributes) == 0 and len(obj.methods) == 1
     assert all(
-        key == "method" and "method(arg" in value for key, value in obj.methods.items()
+        key == "method" and "method(arg" in str(value)
+        for key, value in obj.methods.items()
     )
     assert obj.kind == "interface"
 
@@ -57,7 +65,9 @@ def test_init_data_class():
     obj = ClassChart(MockDataClass)
     assert obj.name == "MockDataClass"
     assert len(obj.attributes) == 1 and len(obj.methods) == 0
-    assert all(key == "attr" and "attr" in value for key, value in obj.methods.items())
+    assert all(
+        key == "attr" and "attr" in str(value) for key, value in obj.methods.items()
+    )
     assert obj.kind == "class"
 
 
@@ -74,12 +84,12 @@ class MockComplexAnnotations:
 
 def test_init_complex_attribute_types():
     obj = ClassChart(MockComplexAnnotations)
-    assert "Union[int, None, float]" in obj.attributes["attr1"]
-    assert "Optional[float]" in obj.attributes["attr2"]
-    assert "Tuple[int, MockCore, Union[int, float]]" in obj.attributes["attr3"]
-    assert "List[Union[bool, Optional[float]]]" in obj.attributes["attr4"]
-    assert "List[Union[None, MockCore]]" in obj.methods["method"]
-    assert "Dict[str, Optional[MockCore]]" in obj.methods["method"]
+    assert "Union[int, None, float]" in str(obj.attributes["attr1"])
+    assert "Optional[float]" in str(obj.attributes["attr2"])
+    assert "Tuple[int, MockCore, Union[int, float]]" in str(obj.attributes["attr3"])
+    assert "List[Union[bool, Optional[float]]]" in str(obj.attributes["attr4"])
+    assert "List[Union[None, MockCore]]" in str(obj.methods["method"])
+    assert "Dict[str, Optional[MockCore]]" in str(obj.methods["method"])
 
 
 class MockClassLevelAnnotation:
@@ -108,26 +118,26 @@ class MockBothAnnotation:
 
 def test_init_attribute_annotation():
     obj_class_level = ClassChart(MockClassLevelAnnotation)
-    assert "dict" in obj_class_level.attributes["attr"]
+    assert "dict" in str(obj_class_level.attributes["attr"])
     obj_instance_level = ClassChart(MockInstanceLevelAnnotation)
-    assert "dict" in obj_instance_level.attributes["attr"]
+    assert "dict" in str(obj_instance_level.attributes["attr"])
     obj_no = ClassChart(MockNoAnnotation)
-    assert "EMPTY" in obj_no.attributes["attr"]
+    assert "EMPTY" in str(obj_no.attributes["attr"])
     obj_both = ClassChart(MockBothAnnotation)
-    assert "dict" in obj_both.attributes["attr"]
+    assert "dict" in str(obj_both.attributes["attr"])
 
 
 def test_init_property():
     obj = ClassChart(MockClass)
     assert "core" in obj.attributes
-    assert "core: bool" == obj.attributes["core"]
+    assert "core: bool" == str(obj.attributes["core"])
     assert "core" not in obj.methods
 
 
 def test_init_staticmethod_classmethod():
     obj = ClassChart(MockClass)
-    assert "{static}" in obj.methods["static_method"]
-    assert "{static}" in obj.methods["class_method"]
+    assert "{static}" in str(obj.methods["static_method"])
+    assert "{static}" in str(obj.methods["class_method"])
 
 
 class MockInstanceLevelAssignment:
@@ -155,5 +165,166 @@ def test_none_simple_attribute_assignment():
     assert "attr3" in obj.attributes
 
 
+class MockOuter:
+    class MockInner:
+        def __init__(self):
+            self.attr_inner = None
+
+    def __init__(self):
+        self.attr_outer = None
+
+
+def test_init_nested_class():
+    obj = ClassChart(MockOuter.MockInner)
+    assert obj.name == "MockInner"
+    assert "attr_inner" in obj.attributes
+    assert "attr_outer" not in obj.attributes
+
+
+def test_init_local_class():
+    class MockLocal:
+        def method(self) -> None:
+            pass
+
+    obj = ClassChart(MockLocal)
+    assert "method" in obj.methods
+
+
+CONFTEST = Path(__file__).parent / "conftest.py"
+
+
+def test_from_source():
+    obj = ClassChart.from_source(CONFTEST, "MockClass")
+    assert obj.module == "test.conftest"
+    assert obj.attributes == ClassChart(MockClass).attributes
+    assert obj.methods == ClassChart(MockClass).methods
+
+
+def test_from_source_missing_class():
+    with pytest.raises(LookupError):
+        ClassChart.from_source(CONFTEST, "MockMissing")
+
+
+def test_module_name(tmp_path):
+    package = tmp_path / "src" / "package"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "module.py").write_text("")
+    assert module_name(package / "module.py") == "package.module"
+    assert module_name(package / "__init__.py") == "package"
+    assert module_name(package / "module.py", tmp_path) == "src.package.module"
+
+
+def test_hash_and_equality():
+    obj1, obj2 = ClassChart(MockClass), ClassChart(MockClass)
+    assert obj1 == obj2 and hash(obj1) == hash(obj2)
+    assert obj1 != ClassChart(MockClass, "interface")
+    assert obj1 != ClassChart(MockCore)
+
+    value = hash(obj1)
+    obj1.attributes["new"] = "new: int"
+    assert hash(obj1) == value
+    assert {obj2: "--|>"}[obj1] == "--|>"
+
+
+def test_member_records():
+    obj = ClassChart(MockClass)
+    assert obj.attributes["_core"].visibility == "-"
+    assert obj.attributes["attr_basic"].type == "int"
+    method = obj.methods["basic_method"]
+    assert method.kind == "method"
+    assert method.params == (("arg1", "MockCore"), ("arg2", "MockCore"))
+    assert method.returns == "List[Union[int, float]]"
+    assert obj.methods["static_method"].kind == "static"
+
+
+class MockNestedScopes:
+    def __init__(self, flag: bool):
+        if flag:
+            self.attr_if: int = 0
+        try:
+            self.attr_try = None
+        except ValueError:
+            self.attr_except = None
+
+        def closure():
+            self.attr_closure = None
+
+        class Nested:
+            def __init__(self):
+                self.attr_nested = None
+
+        def method(self):
+            self.attr_other = None
+
+        callback = lambda: None
+
+
+def test_nested_scopes():
+    obj = ClassChart(MockNestedScopes)
+    assert {"attr_if", "attr_try", "attr_except", "attr_closure"} == set(obj.attributes)
+    assert "attr_if: int" == str(obj.attributes["attr_if"])
+
+
+def test_pickle_recomputes_hash():
+    # pickled in a process with another hash seed, like spawned workers
+    code = (
+        "import pickle, sys; from puml.src import ClassChart; from test import MockCore;"
+        "sys.stdout.buffer.write(pickle.dumps(ClassChart(MockCore)))"
+    )
+    env = {**os.environ, "PYTHONHASHSEED": "1"}
+    data = subprocess.run([sys.executable, "-c", code], capture_output=True, env=env)
+    value = pickle.loads(data.stdout)
+    assert value == ClassChart(MockCore)
+    assert value in {ClassChart(MockCore)}
+
+
+def test_inherited_members():
+    first = ClassChart(MockClass, inherited=True)
+    second = ClassChart(MockClass, inherited=True)
+    assert len(first.inherited) == 1  # MockParent, object is skipped
+    assert first.inherited[0] is second.inherited[0] is base_chart(MockParent)
+    assert first.inherited[0].name == "MockParent"
+
+    lines = str(first).splitlines()
+    assert lines[-4:] == [
+        "\t-- MockParent --",
+        "\t+attr_abstract: bool",
+        "\t+abstract_method(arg: bool) -> bool",
+        "}",
+    ]
+    assert "MockParent" not in str(ClassChart(MockClass))
+
+
+def test_base_chart_cache(tmp_path, monkeypatch):
+    (tmp_path / "cached_base.py").write_text("class Base:\n    attr: int\n")
+    monkeypatch.syspath_prepend(tmp_path)
+    from cached_base import Base
+
+    chart = base_chart(Base)
+    extracted, extract = [], ClassChart._extract
+    monkeypatch.setattr(
+        ClassChart, "_extract", lambda self, node: extracted.append(extract(self, node))
+    )
+    # evicted parse cache entries do not outdate the chart
+    parse_cache.clear()
+    assert base_chart(Base) is chart and not extracted
+
+    (tmp_path / "cached_base.py").write_text("class Base:\n    other: str\n")
+    assert base_chart(Base) is chart and len(extracted) == 1
+    assert "other" in chart.attributes
+
+    # dynamically created classes are not kept alive
+    Dynamic = type("Base", (), {"__module__": "cached_base"})
+    count = len(_base_charts)
+    assert base_chart(Dynamic) is not None and len(_base_charts) == count + 1
+    del Dynamic
+    gc.collect()
+    assert len(_base_charts) == count
+
+    clear_cache()
+    assert len(_base_charts) == 0 and base_chart(Base) is not chart
+
+
 if __name__ == "__main__":
     pass
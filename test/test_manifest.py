@@ -0,0 +1,65 @@
+from os import utime
+
+import pytest
+
+from puml.src import UmlChart, FakeRenderer, Manifest
+
+SOURCE = "class A:\n    def __init__(self):\n        self.attr: int = 0\n"
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_text(SOURCE)
+    return path
+
+
+def test_update_skips_unchanged(tmp_path, source):
+    renderer, manifest = FakeRenderer(), Manifest(tmp_path / "manifest.json")
+    output = tmp_path / "chart.svg"
+
+    uml = UmlChart(renderer=renderer)
+    uml.add_path(source)
+    assert uml.update(output, manifest)
+    assert not uml.update(output, manifest)
+    assert len(renderer.calls) == 1
+
+    # touched without changes
+    utime(source, ns=(0, 0))
+    assert not manifest.outdated(output)
+
+
+def test_update_after_source_change(tmp_path, source):
+    manifest = Manifest(tmp_path / "manifest.json")
+    output = tmp_path / "chart.svg"
+    uml = UmlChart(renderer="fake")
+    uml.add_path(source)
+    uml.update(output, manifest)
+    manifest.save()
+
+    source.write_text(SOURCE.replace("int", "float"))
+    manifest = Manifest(tmp_path / "manifest.json")
+    assert manifest.outdated(output)
+
+
+def test_update_after_chart_change(tmp_path, source):
+    manifest = Manifest(tmp_path / "manifest.json")
+    output = tmp_path / "chart.svg"
+    uml = UmlChart(renderer="fake")
+    a = uml.add_path(source)[0]
+    uml.update(output, manifest)
+    uml.add_relation(a, a, "-->")
+    assert uml.update(output, manifest)
+
+
+def test_update_formats(tmp_path, source):
+    renderer, manifest = FakeRenderer(), Manifest(tmp_path / "manifest.json")
+    uml = UmlChart(renderer=renderer)
+    uml.add_path(source)
+    assert uml.update(tmp_path / "chart.svg", manifest, formats=["png", "puml"])
+    assert (tmp_path / "chart.png").exists() and (tmp_path / "chart.puml").exists()
+    assert not uml.update(tmp_path / "chart.svg", manifest, formats=["png", "puml"])
+    assert [format for _, format in renderer.calls] == ["png"]
+
+    (tmp_path / "chart.puml").unlink()
+    assert uml.update(tmp_path / "chart.svg", manifest, formats=["png", "puml"])
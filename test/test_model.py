@@ -0,0 +1,49 @@
+import pytest
+
+from puml.src import UmlChart
+from puml.src.model import outdated, to_dict
+from test import MockClass, MockCore, MockParent
+
+
+@pytest.fixture
+def uml():
+    uml = UmlChart(root_module="test")
+    uml.add_class(MockParent)
+    uml.add_class(MockClass, inherited=True)
+    uml.infer_relations()
+    charts, _ = uml.partition(by="module", max_classes=1)
+    uml.links.update(charts["test.conftest_2"].links)
+    uml.add_relation(uml.classes[0], UmlChart().add_class(MockCore), "o--")
+    return uml
+
+
+@pytest.mark.parametrize("name", ["model.json", "model.json.gz"])
+def test_save_and_load(tmp_path, uml, name):
+    uml.save(tmp_path / name)
+    loaded = UmlChart.load(tmp_path / name, renderer="fake")
+
+    assert str(loaded) == str(uml)
+    assert loaded.classes == uml.classes
+    assert loaded.relations == uml.relations
+    assert loaded.links == uml.links
+    for before, after in zip(uml.classes, loaded.classes):
+        assert after.attributes == before.attributes
+        assert after.methods == before.methods
+        assert after.bases == before.bases
+        assert after.inherited == before.inherited
+    assert loaded.stats.stages["load"]["classes"] == 2
+    assert "parse" not in loaded.stats.stages
+    assert to_dict(loaded) == to_dict(uml)
+
+
+def test_outdated(tmp_path):
+    source = tmp_path / "module.py"
+    source.write_text("class A:\n    pass\n")
+    uml = UmlChart()
+    uml.add_path(source)
+
+    assert outdated(tmp_path / "model.json")
+    uml.save(tmp_path / "model.json")
+    assert not outdated(tmp_path / "model.json")
+    source.write_text("class A:\n    attr: int\n")
+    assert outdated(tmp_path / "model.json")
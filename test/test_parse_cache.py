@@ -0,0 +1,76 @@
+from os import utime, stat
+
+import pytest
+
+from puml.src import ClassChart, ParseCache, UmlChart, parse_cache
+from test import MockClass, MockCore, MockParent
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    path = tmp_path / "module.py"
+    path.write_text("class A:\n    pass\n")
+    return str(path)
+
+
+def test_parse_once(source_file):
+    cache = ParseCache()
+    first = cache.get(source_file)
+    second = cache.get(source_file)
+    assert first is second
+    assert cache.hits == 1 and cache.misses == 1
+
+
+def test_invalidate_on_change(source_file):
+    cache = ParseCache()
+    first = cache.get(source_file)
+    with open(source_file, "a") as file:
+        file.write("\n\nclass B:\n    pass\n")
+    mtime = stat(source_file).st_mtime_ns + 10**9
+    utime(source_file, ns=(mtime, mtime))
+    second = cache.get(source_file)
+    assert first is not second
+    assert len(second.tree.body) == 2
+    assert cache.misses == 2
+
+
+def test_lru_eviction(tmp_path):
+    cache = ParseCache(maxsize=2)
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"module_{i}.py"
+        path.write_text(f"x = {i}\n")
+        paths.append(str(path))
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+    assert len(cache) == 2
+    assert paths[0] in cache and paths[2] in cache
+    assert paths[1] not in cache
+
+
+def test_clear(source_file):
+    cache = ParseCache()
+    cache.get(source_file)
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0 and cache.misses == 0
+
+
+def test_class_chart_shares_cache():
+    parse_cache.clear()
+    ClassChart(MockClass)
+    ClassChart(MockParent)
+    assert parse_cache.misses == 1
+    assert parse_cache.hits == 1
+
+
+def test_add_class_looks_up_once():
+    parse_cache.clear()
+    parse_cache.hits = parse_cache.misses = 0
+    uml = UmlChart()
+    uml.add_class(MockCore)
+    assert (parse_cache.hits, parse_cache.misses) == (0, 1)
+    assert uml.stats.stages["parse"]["hits"] == 0
@@ -0,0 +1,58 @@
+import pytest
+
+from puml.src import UmlChart
+
+SOURCES = {
+    "pkg_a/one.py": "class A1:\n    pass\n\nclass A2(A1):\n    pass\n",
+    "pkg_a/two.py": "class A3:\n    attr: 'B1'\n",
+    "pkg_b/one.py": "class B1:\n    pass\n\nclass B2:\n    pass\n",
+}
+
+
+@pytest.fixture
+def uml(tmp_path):
+    for path, source in SOURCES.items():
+        (tmp_path / path).parent.mkdir(exist_ok=True)
+        (tmp_path / path).write_text(source)
+    uml = UmlChart()
+    uml.add_path(tmp_path, root=tmp_path)
+    uml.infer_relations()
+    return uml
+
+
+def test_partition_by_package(uml):
+    charts, index = uml.partition()
+    assert list(charts) == ["pkg_a", "pkg_b"]
+    assert [c.name for c in charts["pkg_a"].classes] == ["A1", "A2", "A3"]
+
+    # cross-links to the other chart
+    b1 = charts["pkg_b"].classes[0]
+    assert charts["pkg_a"].links == {b1: "pkg_b.svg"}
+    assert "class .B1 [[pkg_b.svg]] {" in str(charts["pkg_a"])
+    assert len(charts["pkg_b"].links) == 1
+
+    assert [node.name for node in index.links] == ["pkg_a", "pkg_b"]
+    assert list(index.relations.values()) == ["..>"]
+
+
+def test_partition_max_classes(uml):
+    charts, index = uml.partition(by="module", max_classes=1)
+    assert list(charts) == [
+        "pkg_a.one_1",
+        "pkg_a.one_2",
+        "pkg_a.two",
+        "pkg_b.one_1",
+        "pkg_b.one_2",
+    ]
+    assert all(len(chart.classes) == 1 for chart in charts.values())
+
+
+def test_partition_by_component(uml):
+    charts, _ = uml.partition(by="component", link="{name}.png")
+    assert [[c.name for c in chart.classes] for chart in charts.values()] == [
+        ["A1", "A2"],
+        ["A3", "B1"],
+        ["B2"],
+    ]
+    with pytest.raises(ValueError):
+        uml.partition(by="unknown")
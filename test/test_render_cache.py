@@ -0,0 +1,63 @@
+from os import utime
+
+from puml.src import UmlChart, FakeRenderer, RenderCache
+from test import MockCore, MockParent
+
+
+def test_draw_uses_cache(tmp_path):
+    renderer, cache = FakeRenderer(b"<svg/>"), RenderCache(tmp_path / "cache")
+    uml = UmlChart(renderer=renderer, cache=cache)
+    uml.add_class(MockCore)
+    uml.draw(tmp_path / "first.svg")
+    uml.draw(tmp_path / "second.svg")
+    assert len(renderer.calls) == 1
+    assert cache.hits == 1 and cache.misses == 1
+    assert (tmp_path / "second.svg").read_bytes() == b"<svg/>"
+
+
+def test_key_depends_on_source_format_and_renderer():
+    renderer = FakeRenderer()
+    key = RenderCache.key("class A", "svg", renderer)
+    assert key == RenderCache.key("class A", "svg", renderer)
+    assert key != RenderCache.key("class B", "svg", renderer)
+    assert key != RenderCache.key("class A", "png", renderer)
+
+
+def test_link(tmp_path):
+    cache = RenderCache(tmp_path / "cache", link=True)
+    key = RenderCache.key("class A", "svg", FakeRenderer())
+    cache.store(key, b"<svg/>")
+    (tmp_path / "chart.svg").write_bytes(b"old")
+    assert cache.fetch(key, tmp_path / "chart.svg")
+    assert (tmp_path / "chart.svg").stat().st_nlink == 2
+
+
+def test_lru_eviction(tmp_path):
+    directory = tmp_path / "cache"
+    cache = RenderCache(directory, maxsize=10)
+    for i, name in enumerate(["a.svg", "b.svg"]):
+        cache.store(name, b"12345")
+        utime(directory / name, ns=(i, i))
+    cache.fetch("a.svg", tmp_path / "out.svg")
+    cache.store("c.svg", b"12345")
+    assert (directory / "a.svg").exists() and (directory / "c.svg").exists()
+    assert not (directory / "b.svg").exists()
+
+
+def test_link_is_not_overwritten(tmp_path):
+    renderer, cache = FakeRenderer(), RenderCache(tmp_path / "cache", link=True)
+    first, second = UmlChart(renderer=renderer, cache=cache), UmlChart(cache=cache)
+    first.add_class(MockCore)
+    second.add_class(MockParent)
+    output, old = tmp_path / "chart.svg", tmp_path / "old.svg"
+
+    first.draw(output)  # miss
+    first.draw(output)  # hit, linked to the cache entry
+    (tmp_path / "regular.svg").write_bytes(b"")
+    assert output.stat().st_mode == (tmp_path / "regular.svg").stat().st_mode
+    second.draw(output, renderer)  # miss, must not write through the link
+    assert output.read_bytes() == str(second).encode()
+
+    first.draw(old)  # hit of the old key
+    assert old.read_bytes() == str(first).encode()
+    assert len(renderer.calls) == 2
@@ -0,0 +1,144 @@
+import asyncio
+import logging
+import subprocess
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+import pytest
+
+from puml.src import UmlChart, FakeRenderer, LocalRenderer, RemoteRenderer
+from puml.src.renderer import get_renderer
+from test import MockCore
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, puml; print(sorted({'requests', 'plantweb'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_logger_leaves_root_alone():
+    code = "import logging, puml; print(logging.getLogger().handlers)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True
+    )
+    assert result.stdout.strip() == "[]"
+
+    from puml.src import logger
+
+    assert logger.name == "puml"
+    assert isinstance(logger.handlers[0], logging.NullHandler)
+
+
+def test_get_renderer_by_name():
+    assert isinstance(get_renderer("fake"), FakeRenderer)
+    assert isinstance(get_renderer("local"), LocalRenderer)
+    with pytest.raises(ValueError):
+        get_renderer("unknown")
+
+
+def test_get_renderer_reuses_instances(monkeypatch):
+    assert get_renderer("local") is get_renderer("local")
+    monkeypatch.setenv("PUML_RENDERER", "remote")
+    monkeypatch.setenv("PUML_SERVER", "http://first")
+    first = get_renderer()
+    assert get_renderer() is first and first.server == "http://first"
+    monkeypatch.setenv("PUML_SERVER", "http://second")
+    assert get_renderer().server == "http://second"
+
+
+def test_get_renderer_by_environment(monkeypatch):
+    monkeypatch.setenv("PUML_RENDERER", "fake")
+    assert isinstance(get_renderer(), FakeRenderer)
+    monkeypatch.delenv("PUML_RENDERER")
+    assert isinstance(get_renderer(), RemoteRenderer)
+
+
+def test_draw_with_fake_renderer(tmp_path):
+    renderer = FakeRenderer(b"<svg/>")
+    uml = UmlChart(renderer=renderer)
+    uml.add_class(MockCore)
+    uml.draw(tmp_path / "chart.svg")
+    assert (tmp_path / "chart.svg").read_bytes() == b"<svg/>"
+    assert renderer.calls == [(str(uml), "svg")]
+
+
+def test_local_renderer(tmp_path):
+    script = tmp_path / "plantuml.py"
+    script.write_text(
+        "import sys\n" "sys.stdout.write(sys.argv[2] + ':' + sys.stdin.read())\n"
+    )
+    renderer = LocalRenderer(f"{sys.executable} {script}")
+    output = renderer.render("class A", "png").decode()
+    assert output.startswith("-tpng:@startuml\nclass A\n")
+
+
+def test_local_renderer_failure(tmp_path):
+    renderer = LocalRenderer(f"{sys.executable} -c 'import sys; sys.exit(3)'")
+    with pytest.raises(RuntimeError):
+        renderer.render("class A")
+
+
+@pytest.fixture
+def server():
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            requests.append((self.path, self.client_address))
+            body = f"<svg>{self.path}</svg>".encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/plantuml/", requests
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_remote_renderer(server):
+    url, requests = server
+    output = RemoteRenderer(url).render("class A", "png")
+    assert output.startswith(b"<svg>/plantuml/png/")
+    assert len(requests) == 1
+
+
+def test_adraw_many(server, tmp_path):
+    url, requests = server
+    charts = []
+    for i in range(6):
+        uml = UmlChart()
+        uml.add_class(MockCore)
+        charts.append((uml, tmp_path / f"chart_{i}.svg"))
+    asyncio.run(UmlChart.adraw_many(charts, RemoteRenderer(url), limit=2))
+    assert all(file.read_bytes().startswith(b"<svg>") for _, file in charts)
+    # kept-alive connections are reused
+    assert len({address for _, address in requests}) <= 2
+
+
+def test_draw_formats(tmp_path):
+    renderer = FakeRenderer(b"image")
+    uml = UmlChart(renderer=renderer)
+    uml.add_class(MockCore)
+    files = uml.draw(tmp_path / "chart.svg", formats=["svg", "png", "puml"])
+
+    assert files == [str(tmp_path / f"chart.{f}") for f in ("svg", "png", "puml")]
+    assert sorted(format for _, format in renderer.calls) == ["png", "svg"]
+    assert {code for code, _ in renderer.calls} == {str(uml)}
+    assert (tmp_path / "chart.png").read_bytes() == b"image"
+    assert (tmp_path / "chart.puml").read_text() == f"@startuml\n{uml}\n@enduml\n"
+    assert uml.stats.stages["emit"]["calls"] == 1
+    assert uml.stats.stages["render"]["calls"] == 2
@@ -0,0 +1,70 @@
+import sys
+
+import pytest
+
+from puml.src import UmlChart, RenderSession
+from test import MockCore, MockParent
+
+# stand-in for "plantuml -pipe -t<format> -pipedelimitor <delimiter>"
+PIPE_SCRIPT = """
+import sys, time
+format, delimiter = sys.argv[2][2:], sys.argv[4]
+lines = []
+for line in sys.stdin:
+    lines.append(line)
+    if line.startswith("@enduml"):
+        if "MockSleep" in "".join(lines):
+            time.sleep(10)
+        sys.stdout.write(f"<{format}>{len(lines)}{delimiter}\\n")
+        sys.stdout.flush()
+        lines = []
+"""
+
+
+@pytest.fixture
+def command(tmp_path):
+    script = tmp_path / "plantuml.py"
+    script.write_text(PIPE_SCRIPT)
+    return f"{sys.executable} {script}"
+
+
+def test_session_reuses_process(command):
+    with RenderSession(command, workers=1) as session:
+        first = session.render("class A")
+        second = session.render("class A\nclass B", "svg")
+        assert first == b"<svg>3"
+        assert second == b"<svg>4"
+        assert len(session._processes) == 1
+    assert session._processes == []
+
+
+def test_session_timeout(command):
+    with RenderSession(command, timeout=0.5, workers=1) as session:
+        with pytest.raises(TimeoutError):
+            session.render("class MockSleep")
+        assert session.render("class A") == b"<svg>3"
+
+
+def test_draw_many(command, tmp_path):
+    charts = []
+    for i, cls in enumerate([MockCore, MockParent, MockCore]):
+        uml = UmlChart()
+        uml.add_class(cls)
+        charts.append((uml, tmp_path / f"chart_{i}.svg"))
+    UmlChart.draw_many(charts, command=command, workers=2)
+    assert all(file.read_bytes().startswith(b"<svg>") for _, file in charts)
+
+
+def test_session_start_failure(command):
+    with RenderSession("/nonexistent", timeout=1, workers=1) as session:
+        for _ in range(2):
+            with pytest.raises(FileNotFoundError):
+                session.render("class A")
+
+    with RenderSession(command, timeout=0.5, workers=1) as session:
+        session.render("class A")
+        session.command = ["/nonexistent"]
+        with pytest.raises(TimeoutError):
+            session.render("class MockSleep")
+        with pytest.raises(FileNotFoundError):
+            session.render("class A")
@@ -0,0 +1,158 @@
+from threading import Event, Thread
+
+from puml.src import ClassChart, UmlChart, FakeRenderer, Manifest
+from puml.src.model import outdated
+from puml.src.watch import Watcher
+
+
+def test_poll_updates_in_place(tmp_path):
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    (tmp_path / "b.py").write_text("class B:\n    pass\n")
+    renderer = FakeRenderer()
+    first, second = UmlChart(), UmlChart()
+    a, b = first.add_path(tmp_path / "a.py") + first.add_path(tmp_path / "b.py")
+    first.add_relation(a, b)
+    second.add_path(tmp_path / "b.py")
+    watcher = Watcher(
+        [(first, tmp_path / "1.svg"), (second, tmp_path / "2.svg")],
+        renderer,
+        debounce=0.01,
+    )
+    assert watcher.poll() == []
+
+    (tmp_path / "a.py").write_text("class A:\n    attr: int\n")
+    assert watcher.poll() == [tmp_path / "1.svg"]
+    assert first.classes[0] is a and "+attr: int" in renderer.calls[-1][0]
+    assert first.relations == {(a, b): "--|>"}
+
+    # invalid sources keep the last state
+    (tmp_path / "a.py").write_text("class A(:\n")
+    assert watcher.poll() == [tmp_path / "1.svg"]
+    assert "+attr: int" in str(a)
+
+
+def test_run_until_stopped(tmp_path):
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    uml, renderer, stop = UmlChart(), FakeRenderer(), Event()
+    uml.add_path(tmp_path / "a.py")
+    watcher = Watcher([(uml, tmp_path / "a.svg")], renderer, 0.01, 0.01)
+    thread = Thread(target=watcher.run, args=(stop,))
+    thread.start()
+
+    (tmp_path / "a.py").write_text("class A:\n    def run(self):\n        pass\n")
+    for _ in range(200):
+        if renderer.calls:
+            break
+        stop.wait(0.01)
+    stop.set()
+    thread.join()
+    assert "+run() -> EMPTY" in renderer.calls[0][0]
+
+
+def test_poll_updates_equal_classes_of_all_charts(tmp_path):
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    renderer, first, second = FakeRenderer(), UmlChart(), UmlChart()
+    first.add_path(tmp_path / "a.py")
+    second.add_path(tmp_path / "a.py")
+    watcher = Watcher(
+        [(first, tmp_path / "1.svg"), (second, tmp_path / "2.svg")],
+        renderer,
+        debounce=0.01,
+    )
+
+    (tmp_path / "a.py").write_text("class A:\n    attr: int\n")
+    assert len(watcher.poll()) == 2
+    assert all("+attr: int" in code for code, _ in renderer.calls)
+
+
+def test_poll_retries_failed_drawings(tmp_path):
+    class _FailingRenderer(FakeRenderer):
+        def render(self, code, format="svg"):
+            if not self.calls:
+                self.calls.append(None)
+                raise RuntimeError("server down")
+            return super().render(code, format)
+
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    uml, renderer = UmlChart(), _FailingRenderer()
+    uml.add_path(tmp_path / "a.py")
+    watcher = Watcher([(uml, tmp_path / "a.svg")], renderer, debounce=0.01)
+
+    (tmp_path / "a.py").write_text("class A:\n    attr: int\n")
+    assert watcher.poll() == []
+    assert watcher.poll() == [tmp_path / "a.svg"]
+    assert "+attr: int" in renderer.calls[-1][0]
+    assert watcher.poll() == []
+
+
+def test_base_class_changes(tmp_path, monkeypatch):
+    (tmp_path / "watch_base.py").write_text("class Base:\n    pass\n")
+    (tmp_path / "watch_child.py").write_text(
+        "from watch_base import Base\n\nclass Child(Base):\n    pass\n"
+    )
+    monkeypatch.syspath_prepend(tmp_path)
+    from watch_child import Child
+
+    renderer, manifest = FakeRenderer(), Manifest(tmp_path / "manifest.json")
+    uml = UmlChart(renderer=renderer)
+    uml.add_class(Child, inherited=True)
+    uml.update(tmp_path / "child.svg", manifest)
+    uml.save(tmp_path / "model.json")
+    watcher = Watcher([(uml, tmp_path / "child.svg")], debounce=0.01)
+
+    (tmp_path / "watch_base.py").write_text("class Base:\n    attr: int\n")
+    assert manifest.outdated(tmp_path / "child.svg")
+    assert outdated(tmp_path / "model.json")
+    assert watcher.poll() == [tmp_path / "child.svg"]
+    assert "+attr: int" in renderer.calls[-1][0]
+    assert "+attr: int" in str(ClassChart(Child, inherited=True))
+
+    # the shared base chart follows the file without a watcher
+    (tmp_path / "watch_base.py").write_text("class Base:\n    other: str\n")
+    assert "+other: str" in str(ClassChart(Child, inherited=True))
+
+
+def test_base_class_updated_once(tmp_path, monkeypatch):
+    (tmp_path / "once_base.py").write_text("class Base:\n    pass\n")
+    (tmp_path / "once_children.py").write_text(
+        "from once_base import Base\n"
+        + "".join(f"\nclass Child{i}(Base):\n    pass\n" for i in range(20))
+    )
+    monkeypatch.syspath_prepend(tmp_path)
+    import once_children
+
+    uml = UmlChart()
+    for i in range(20):
+        uml.add_class(getattr(once_children, f"Child{i}"), inherited=True)
+    watcher = Watcher([(uml, tmp_path / "a.svg")], FakeRenderer(), debounce=0.01)
+    extracted, extract = [], ClassChart._extract
+
+    def _extract(self, node):
+        extracted.append(self.name)
+        extract(self, node)
+
+    monkeypatch.setattr(ClassChart, "_extract", _extract)
+    (tmp_path / "once_children.py").write_text(
+        (tmp_path / "once_children.py").read_text() + "\n"
+    )
+    watcher.poll()
+    assert len(extracted) == 20 and "Base" not in extracted
+
+    extracted.clear()
+    (tmp_path / "once_base.py").write_text("class Base:\n    attr: int\n")
+    watcher.poll()
+    assert extracted == ["Base"]
+
+
+def test_poll_draws_formats(tmp_path):
+    (tmp_path / "a.py").write_text("class A:\n    pass\n")
+    uml, renderer = UmlChart(), FakeRenderer()
+    uml.add_path(tmp_path / "a.py")
+    watcher = Watcher(
+        [(uml, tmp_path / "a.svg", ["png", "puml"])], renderer, 0.01, 0.01
+    )
+
+    (tmp_path / "a.py").write_text("class A:\n    attr: int\n")
+    assert watcher.poll() == [tmp_path / "a.svg"]
+    assert [format for _, format in renderer.calls] == ["png"]
+    assert "+attr: int" in (tmp_path / "a.puml").read_text()